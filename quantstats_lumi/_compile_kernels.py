@@ -0,0 +1,79 @@
+#!/usr/bin/env python
+# -*- coding: UTF-8 -*-
+#
+# QuantStats: Portfolio analytics for quants
+# https://github.com/ranaroussi/quantstats
+#
+# Copyright 2019-2023 Ran Aroussi
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+"""
+Ahead-of-time compiles the kernels in _numba_kernels.py into a native
+_qs_kernels extension module, so short-lived scripts don't pay numba's
+compile / cache loading time on first use.
+
+numba is only needed to build the extension, not to use it:
+
+    $ python -m quantstats_lumi._compile_kernels
+"""
+
+import importlib.util as _importlib_util
+import os as _os
+import tempfile as _tempfile
+
+# keep in sync with the <name>_numba kernels in _numba_kernels.py
+SIGNATURES = {
+    "_comp": "f8(f8[:])",
+    "_drawdown_periods": "Tuple((i8[:], i8[:], i8[:], f8[:]))(f8[:])",
+    "_drawdown_scan": "Tuple((f8, f8[:], i8[:], i8[:], i8[:], f8[:]))(f8[:])",
+    "_max_true_run_words": "i8(u8[:])",
+    "_moments": "Tuple((f8, f8, f8, i8))(f8[:])",
+    "_omega_sums": "Tuple((f8, f8))(f8[:], f8)",
+    "_rolling_downside": "f8[:](f8[:], i8)",
+    "_tail_mean": "f8(f8[:], f8)",
+}
+
+
+def compile_kernels(output_dir=None):
+    """Builds the _qs_kernels extension (next to this file by default)"""
+    from numba import config
+    from numba.pycc import CC
+
+    here = _os.path.dirname(_os.path.abspath(__file__))
+
+    # the standalone copy would share (and break) the package's
+    # on-disk jit cache, point it to a throwaway directory instead
+    cache_dir = config.CACHE_DIR
+    with _tempfile.TemporaryDirectory() as tmp:
+        config.CACHE_DIR = tmp
+        try:
+            # load the kernels' source standalone, so an existing build
+            # of the extension doesn't shadow the functions to compile
+            spec = _importlib_util.spec_from_file_location(
+                "_qs_kernels_source", _os.path.join(here, "_numba_kernels.py")
+            )
+            kernels = _importlib_util.module_from_spec(spec)
+            spec.loader.exec_module(kernels)
+
+            cc = CC("_qs_kernels")
+            cc.output_dir = output_dir or here
+            for name, signature in SIGNATURES.items():
+                cc.export(name, signature)(getattr(kernels, name + "_numba").py_func)
+            cc.compile()
+        finally:
+            config.CACHE_DIR = cache_dir
+
+
+if __name__ == "__main__":
+    compile_kernels()
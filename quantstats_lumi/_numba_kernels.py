@@ -0,0 +1,430 @@
+#!/usr/bin/env python
+# -*- coding: UTF-8 -*-
+#
+# QuantStats: Portfolio analytics for quants
+# https://github.com/ranaroussi/quantstats
+#
+# Copyright 2019-2023 Ran Aroussi
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+"""
+Compiled kernels for the hot loops in stats.py.
+
+numba is optional: when it's not installed the kernels
+run as plain python functions with the same results.
+"""
+
+import numpy as _np
+
+_HAS_NUMBA = False
+try:
+    from numba import njit as _njit
+
+    _HAS_NUMBA = True
+except ImportError:
+    pass
+
+# ahead-of-time compiled kernels, when built (see _compile_kernels.py)
+_HAS_AOT = False
+try:
+    from . import _qs_kernels as _aot
+
+    _HAS_AOT = True
+except ImportError:
+    _aot = None
+
+
+def _jit(func):
+    """Compiles func with numba when available"""
+    if not _HAS_NUMBA:
+        return func
+    # numpy error model: x / 0 gives inf/nan instead of raising
+    return _njit(cache=True, error_model="numpy")(func)
+
+
+@_jit
+def _drawdown_periods_numba(dd):
+    """
+    Locates every drawdown period in a drawdown series and
+    returns the (start, valley, end) positions and the min
+    drawdown of each period
+    """
+    n = dd.shape[0]
+    starts = _np.empty(n + 1, dtype=_np.int64)
+    ends = _np.empty(n + 1, dtype=_np.int64)
+    n_starts = 0
+    n_ends = 0
+
+    # nan counts as "in drawdown", same as (dd == 0) being False
+    for i in range(1, n):
+        if dd[i - 1] == 0:
+            if dd[i] != 0:
+                starts[n_starts] = i
+                n_starts += 1
+        elif dd[i] == 0:
+            ends[n_ends] = i - 1
+            n_ends += 1
+
+    # no drawdown :)
+    if n_starts == 0:
+        return starts[:0], starts[:0], ends[:0], _np.empty(0)
+
+    # drawdown series begins in a drawdown
+    if n_ends > 0 and starts[0] > ends[0]:
+        for i in range(n_starts, 0, -1):
+            starts[i] = starts[i - 1]
+        starts[0] = 0
+        n_starts += 1
+
+    # series ends in a drawdown fill with last position
+    if n_ends == 0 or starts[n_starts - 1] > ends[n_ends - 1]:
+        ends[n_ends] = n - 1
+        n_ends += 1
+
+    count = min(n_starts, n_ends)
+    valleys = _np.empty(count, dtype=_np.int64)
+    mins = _np.empty(count)
+    for k in range(count):
+        valley = starts[k]
+        low = dd[valley]
+        for i in range(starts[k], ends[k] + 1):
+            if dd[i] < low or (low != low and dd[i] == dd[i]):
+                low = dd[i]
+                valley = i
+        valleys[k] = valley
+        mins[k] = low
+
+    return starts[:count], valleys, ends[:count], mins
+
+
+@_jit
+def _drawdown_scan_numba(prices):
+    """
+    Single pass over a price series returning
+    (max drawdown, drawdown series, starts, ends, valleys, mins)
+    """
+    n = prices.shape[0]
+    dd = _np.empty(n)
+    running_max = _np.nan
+    max_dd = _np.nan
+
+    # nans are skipped by the running max, like expanding().max()
+    for i in range(n):
+        if prices[i] > running_max or running_max != running_max:
+            running_max = prices[i]
+        dd[i] = prices[i] / running_max - 1.0
+        if dd[i] < max_dd or max_dd != max_dd:
+            max_dd = dd[i]
+
+    starts, valleys, ends, mins = _drawdown_periods_numba(dd)
+    return max_dd, dd, starts, ends, valleys, mins
+
+
+@_jit
+def _max_true_run_words_numba(words):
+    """
+    Length of the longest run of set bits in a bitmask packed into
+    little-endian uint64 words (see _max_true_run_packed), handling 64 flags
+    per iteration instead of one
+    """
+    one = _np.uint64(1)
+    high = _np.uint64(63)
+    longest = 0
+    current = 0
+    for word in words:
+        # all ones, the run carries on through the whole word
+        if word == ~_np.uint64(0):
+            current += 64
+            continue
+
+        # the run carried over ends in the word's lowest bits
+        low = 0
+        while (word >> _np.uint64(low)) & one:
+            low += 1
+        if current + low > longest:
+            longest = current + low
+
+        # longest run inside the word, each x & (x >> 1)
+        # shortens every run of ones by one bit
+        inner = 0
+        x = word
+        while x:
+            x &= x >> one
+            inner += 1
+        if inner > longest:
+            longest = inner
+
+        # a new run starts in the word's highest bits
+        current = 0
+        while (word >> (high - _np.uint64(current))) & one:
+            current += 1
+
+    if current > longest:
+        longest = current
+    return longest
+
+
+@_jit
+def _moments_numba(values):
+    """
+    Welford pass returning the mean, std (ddof=1), downside deviation
+    and count of values. nans are skipped, except for the downside
+    deviation which divides by the full length (see stats.sortino)
+    """
+    count = 0
+    mean = 0.0
+    m2 = 0.0
+    downside = 0.0
+    for value in values:
+        if value != value:
+            continue
+        count += 1
+        delta = value - mean
+        mean += delta / count
+        m2 += delta * (value - mean)
+        if value < 0:
+            downside += value * value
+
+    if count == 0:
+        mean = _np.nan
+    std = _np.sqrt(m2 / (count - 1)) if count > 1 else _np.nan
+    downside = _np.sqrt(downside / len(values)) if len(values) else _np.nan
+    return mean, std, downside, count
+
+
+@_jit
+def _compensated_add_numba(total, error, value):
+    """Neumaier summation step, returns the new (total, error)"""
+    result = total + value
+    if abs(total) >= abs(value):
+        error += (total - result) + value
+    else:
+        error += (value - result) + total
+    return result, error
+
+
+@_jit
+def _rolling_downside_numba(values, window):
+    """
+    Rolling sum of squared negative values over full windows, nan
+    where the window holds a nan (same as pandas' rolling().apply)
+    """
+    n = values.shape[0]
+    out = _np.full(n, _np.nan)
+    # compensated, so small windows following large losses stay accurate
+    total = 0.0
+    error = 0.0
+    negatives = 0
+    nans = 0
+    for i in range(n):
+        value = values[i]
+        if value != value:
+            nans += 1
+        elif value < 0:
+            total, error = _compensated_add_numba(total, error, value * value)
+            negatives += 1
+
+        if i >= window:
+            old = values[i - window]
+            if old != old:
+                nans -= 1
+            elif old < 0:
+                total, error = _compensated_add_numba(total, error, -old * old)
+                negatives -= 1
+                if negatives == 0:
+                    # no losses left, drop any leftover rounding
+                    total = 0.0
+                    error = 0.0
+
+        if i >= window - 1 and nans == 0:
+            out[i] = max(total + error, 0.0)
+    return out
+
+
+@_jit
+def _comp_numba(values):
+    """Total compounded return, prod(1 + values) - 1 skipping nans"""
+    total = 1.0
+    for value in values:
+        if value == value:
+            total *= 1.0 + value
+    return total - 1.0
+
+
+@_jit
+def _omega_sums_numba(values, threshold):
+    """
+    Sums of the gains and (positive) losses of
+    values over threshold, skipping nans
+    """
+    gains = 0.0
+    losses = 0.0
+    for value in values:
+        excess = value - threshold
+        if excess > 0:
+            gains += excess
+        elif excess < 0:
+            losses -= excess
+    return gains, losses
+
+
+@_jit
+def _tail_mean_numba(values, threshold):
+    """Mean of the values below threshold, nan when there are none"""
+    total = 0.0
+    count = 0
+    for value in values:
+        if value < threshold:
+            total += value
+            count += 1
+    return total / count if count else _np.nan
+
+
+def _drawdown_periods_numpy(dd):
+    """Vectorized version of _drawdown_periods_numba"""
+    n = dd.shape[0]
+
+    # -1 where a drawdown starts, +1 on its last date
+    changes = _np.diff((dd == 0).view(_np.int8))
+    starts = _np.flatnonzero(changes == -1) + 1
+    ends = _np.flatnonzero(changes == 1)
+
+    # no drawdown :)
+    if not len(starts):
+        return starts, starts, ends[:0], _np.empty(0)
+
+    # drawdown series begins in a drawdown
+    if len(ends) and starts[0] > ends[0]:
+        starts = _np.r_[0, starts]
+
+    # series ends in a drawdown fill with last position
+    if not len(ends) or starts[-1] > ends[-1]:
+        ends = _np.r_[ends, n - 1]
+
+    # per-period min, reducing over [start, end + 1) slices
+    bounds = _np.column_stack((starts, ends + 1)).ravel()
+    mins = _np.fmin.reduceat(_np.append(dd, _np.nan), bounds)[::2]
+
+    # valley is the first position hitting the period's min
+    lengths = ends - starts + 1
+    period = _np.repeat(_np.arange(len(starts)), lengths)
+    offsets = starts - _np.cumsum(lengths) + lengths
+    pos = _np.arange(lengths.sum()) + _np.repeat(offsets, lengths)
+    hit = dd[pos] == mins[period]
+    found, first = _np.unique(period[hit], return_index=True)
+    valleys = starts.copy()
+    valleys[found] = pos[hit][first]
+
+    return starts, valleys, ends, mins
+
+
+def _drawdown_scan_numpy(prices):
+    """Vectorized version of _drawdown_scan_numba"""
+    with _np.errstate(divide="ignore", invalid="ignore"):
+        dd = prices / _np.fmax.accumulate(prices) - 1.0
+    max_dd = _np.fmin.reduce(dd) if len(dd) else _np.nan
+    starts, valleys, ends, mins = _drawdown_periods_numpy(dd)
+    return max_dd, dd, starts, ends, valleys, mins
+
+
+def _max_true_run_numpy(flags):
+    """Vectorized version of _max_true_run_packed"""
+    edges = _np.diff(_np.r_[False, flags, False].astype(_np.int8))
+    runs = _np.flatnonzero(edges == -1) - _np.flatnonzero(edges == 1)
+    return int(runs.max()) if len(runs) else 0
+
+
+def _moments_numpy(values):
+    """Vectorized version of _moments_numba"""
+    valid = values[values == values]
+    count = len(valid)
+    mean = valid.mean() if count else _np.nan
+    std = valid.std(ddof=1) if count > 1 else _np.nan
+    downside = (
+        _np.sqrt((valid[valid < 0] ** 2).sum() / len(values))
+        if len(values)
+        else _np.nan
+    )
+    return mean, std, downside, count
+
+
+def _rolling_downside_numpy(values, window):
+    """Vectorized version of _rolling_downside_numba"""
+    out = _np.full(values.shape[0], _np.nan)
+    if window > values.shape[0]:
+        return out
+    # nans survive the clip, so windows holding one sum to nan
+    squares = _np.minimum(values, 0) ** 2
+    windows = _np.lib.stride_tricks.sliding_window_view(squares, window)
+    out[window - 1 :] = windows.sum(axis=1)
+    return out
+
+
+def _comp_numpy(values):
+    """Vectorized version of _comp_numba"""
+    return _np.nanprod(values + 1.0) - 1.0
+
+
+def _omega_sums_numpy(values, threshold):
+    """Vectorized version of _omega_sums_numba"""
+    excess = values - threshold
+    return excess[excess > 0].sum(), -excess[excess < 0].sum()
+
+
+def _tail_mean_numpy(values, threshold):
+    """Vectorized version of _tail_mean_numba"""
+    tail = values[values < threshold]
+    return tail.mean() if len(tail) else _np.nan
+
+
+def _max_true_run_packed(flags):
+    """Length of the longest run of True values"""
+    # pack 64 flags per word, zero padding never extends a run
+    packed = _np.packbits(flags, bitorder="little")
+    packed = _np.pad(packed, (0, -len(packed) % 8))
+    return int(_max_true_run_words(packed.view("<u8")))
+
+
+# pick each kernel once: the ahead-of-time compiled ones need neither
+# numba nor warm up, and without numba the interpreted loops would be
+# slow, so the vectorized versions are used instead
+if _HAS_AOT:
+    _comp = _aot._comp
+    _drawdown_periods = _aot._drawdown_periods
+    _drawdown_scan = _aot._drawdown_scan
+    _max_true_run_words = _aot._max_true_run_words
+    _max_true_run = _max_true_run_packed
+    _moments = _aot._moments
+    _omega_sums = _aot._omega_sums
+    _rolling_downside = _aot._rolling_downside
+    _tail_mean = _aot._tail_mean
+elif _HAS_NUMBA:
+    _comp = _comp_numba
+    _drawdown_periods = _drawdown_periods_numba
+    _drawdown_scan = _drawdown_scan_numba
+    _max_true_run_words = _max_true_run_words_numba
+    _max_true_run = _max_true_run_packed
+    _moments = _moments_numba
+    _omega_sums = _omega_sums_numba
+    _rolling_downside = _rolling_downside_numba
+    _tail_mean = _tail_mean_numba
+else:
+    _comp = _comp_numpy
+    _drawdown_periods = _drawdown_periods_numpy
+    _drawdown_scan = _drawdown_scan_numpy
+    _max_true_run = _max_true_run_numpy
+    _moments = _moments_numpy
+    _omega_sums = _omega_sums_numpy
+    _rolling_downside = _rolling_downside_numpy
+    _tail_mean = _tail_mean_numpy
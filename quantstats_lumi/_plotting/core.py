@@ -126,8 +126,7 @@ def plot_returns_bars(
         if isinstance(returns, _pd.Series):
             df = df[[benchmark.name, returns.name]]
         elif isinstance(returns, _pd.DataFrame):
-            col_names = [benchmark.name, returns.columns]
-            df = df[list(_pd.core.common.flatten(col_names))]
+            df = df[[benchmark.name] + list(returns.columns)]
 
     df = df.dropna()
     if resample is not None:
@@ -149,8 +148,8 @@ def plot_returns_bars(
         ax.set_title(
             "%s - %s           \n"
             % (
-                df.index.date[:1][0].strftime("%Y"),
-                df.index.date[-1:][0].strftime("%Y"),
+                df.index[0].strftime("%Y"),
+                df.index[-1].strftime("%Y"),
             ),
             fontsize=12,
             color="gray",
@@ -304,8 +303,8 @@ def plot_timeseries(
         ax.set_title(
             "%s - %s            \n"
             % (
-                returns.index.date[:1][0].strftime("%e %b '%y"),
-                returns.index.date[-1:][0].strftime("%e %b '%y"),
+                returns.index[0].strftime("%e %b '%y"),
+                returns.index[-1].strftime("%e %b '%y"),
             ),
             fontsize=12,
             color="gray",
@@ -456,8 +455,8 @@ def plot_histogram(
         ax.set_title(
             "%s - %s           \n"
             % (
-                returns.index.date[:1][0].strftime("%Y"),
-                returns.index.date[-1:][0].strftime("%Y"),
+                returns.index[0].strftime("%Y"),
+                returns.index[-1].strftime("%Y"),
             ),
             fontsize=12,
             color="gray",
@@ -646,8 +645,7 @@ def plot_rolling_stats(
                 df[returns_label].dropna(), lw=lw, label=returns.name, color=colors[1]
             )
         elif isinstance(returns, _pd.DataFrame):
-            col_names = ["Benchmark", returns_label]
-            df = df[list(_pd.core.common.flatten(col_names))].dropna()
+            df = df[["Benchmark"] + returns_label].dropna()
             for i, col in enumerate(returns_label):
                 ax.plot(df[col], lw=lw, label=col, color=colors[i + 1])
         ax.plot(
@@ -677,8 +675,8 @@ def plot_rolling_stats(
         ax.set_title(
             "%s - %s           \n"
             % (
-                df.index.date[:1][0].strftime("%e %b '%y"),
-                df.index.date[-1:][0].strftime("%e %b '%y"),
+                df.index[0].strftime("%e %b '%y"),
+                df.index[-1].strftime("%e %b '%y"),
             ),
             fontsize=12,
             color="gray",
@@ -765,8 +763,8 @@ def plot_rolling_beta(
         ax.set_title(
             "%s - %s           \n"
             % (
-                returns.index.date[:1][0].strftime("%e %b '%y"),
-                returns.index.date[-1:][0].strftime("%e %b '%y"),
+                returns.index[0].strftime("%e %b '%y"),
+                returns.index[-1].strftime("%e %b '%y"),
             ),
             fontsize=12,
             color="gray",
@@ -891,13 +889,17 @@ def plot_longest_drawdowns(
         compounded=True,
         savefig=None,
         show=True,
+        dd=None,
+        dd_details=None,
 ):
     colors = ["#348dc1", "#003366", "red"]
     if grayscale:
         colors = ["#000000"] * 3
 
-    dd = _stats.to_drawdown_series(returns.fillna(0))
-    dddf = _stats.drawdown_details(dd)
+    # dd / dd_details: precomputed drawdown series and its details
+    if dd is None:
+        dd = _stats.to_drawdown_series(returns.fillna(0))
+    dddf = _stats.drawdown_details(dd) if dd_details is None else dd_details
     longest_dd = dddf.sort_values(by="days", ascending=False, kind="mergesort")[
                  :periods
                  ]
@@ -920,8 +922,8 @@ def plot_longest_drawdowns(
         ax.set_title(
             "%s - %s           \n"
             % (
-                returns.index.date[:1][0].strftime("%e %b '%y"),
-                returns.index.date[-1:][0].strftime("%e %b '%y"),
+                returns.index[0].strftime("%e %b '%y"),
+                returns.index[-1].strftime("%e %b '%y"),
             ),
             fontsize=12,
             color="gray",
@@ -1048,8 +1050,8 @@ def plot_distribution(
         ax.set_title(
             "%s - %s            \n"
             % (
-                returns.index.date[:1][0].strftime("%e %b '%y"),
-                returns.index.date[-1:][0].strftime("%e %b '%y"),
+                returns.index[0].strftime("%e %b '%y"),
+                returns.index[-1].strftime("%e %b '%y"),
             ),
             fontsize=12,
             color="gray",
@@ -122,8 +122,8 @@ def snapshot(
             axes[0].set_title(
                 "%s - %s ;  Sharpe: %.2f                      \n"
                 % (
-                    returns.index.date[:1][0].strftime("%e %b '%y"),
-                    returns.index.date[-1:][0].strftime("%e %b '%y"),
+                    returns.index[0].strftime("%e %b '%y"),
+                    returns.index[-1].strftime("%e %b '%y"),
                     _stats.sharpe(returns),
                 ),
                 fontsize=12,
@@ -133,8 +133,8 @@ def snapshot(
             axes[0].set_title(
                 "\n%s - %s ;  "
                 % (
-                    returns.index.date[:1][0].strftime("%e %b '%y"),
-                    returns.index.date[-1:][0].strftime("%e %b '%y"),
+                    returns.index[0].strftime("%e %b '%y"),
+                    returns.index[-1].strftime("%e %b '%y"),
                 ),
                 fontsize=12,
                 color="gray",
@@ -292,8 +292,8 @@ def earnings(
         ax.set_title(
             "\n%s - %s ;  P&L: %s (%s)                "
             % (
-                returns.index.date[1:2][0].strftime("%e %b '%y"),
-                returns.index.date[-1:][0].strftime("%e %b '%y"),
+                returns.index[1].strftime("%e %b '%y"),
+                returns.index[-1].strftime("%e %b '%y"),
                 _utils._score_str(
                     "${:,}".format(round(returns.values[-1] - returns.values[0], 2))
                 ),
@@ -671,8 +671,11 @@ def drawdown(
     subtitle=True,
     savefig=None,
     show=True,
+    dd=None,
 ):
-    dd = _stats.to_drawdown_series(returns)
+    # dd: precomputed drawdown series of returns
+    if dd is None:
+        dd = _stats.to_drawdown_series(returns)
 
     fig = _core.plot_timeseries(
         dd,
@@ -714,6 +717,8 @@ def drawdowns_periods(
     savefig=None,
     show=True,
     prepare_returns=True,
+    dd=None,
+    dd_details=None,
 ):
     if prepare_returns:
         returns = _utils._prepare_returns(returns)
@@ -732,6 +737,8 @@ def drawdowns_periods(
         compounded=compounded,
         savefig=savefig,
         show=show,
+        dd=dd,
+        dd_details=dd_details,
     )
     if not show:
         return fig
@@ -794,11 +801,16 @@ def rolling_volatility(
     subtitle=True,
     savefig=None,
     show=True,
+    prepare_returns=True,
 ):
-    returns = _stats.rolling_volatility(returns, period, periods_per_year)
+    returns = _stats.rolling_volatility(
+        returns, period, periods_per_year, prepare_returns=prepare_returns
+    )
 
     if benchmark is not None:
-        benchmark = _utils._prepare_benchmark(benchmark, returns.index)
+        benchmark = _utils._prepare_benchmark(
+            benchmark, returns.index, prepare_returns=prepare_returns
+        )
         benchmark = _stats.rolling_volatility(
             benchmark, period, periods_per_year, prepare_returns=False
         )
@@ -837,6 +849,7 @@ def rolling_sharpe(
     subtitle=True,
     savefig=None,
     show=True,
+    prepare_returns=True,
 ):
     returns = _stats.rolling_sharpe(
         returns,
@@ -844,10 +857,13 @@ def rolling_sharpe(
         period,
         True,
         periods_per_year,
+        prepare_returns=prepare_returns,
     )
 
     if benchmark is not None:
-        benchmark = _utils._prepare_benchmark(benchmark, returns.index, rf)
+        benchmark = _utils._prepare_benchmark(
+            benchmark, returns.index, rf, prepare_returns=prepare_returns
+        )
         benchmark = _stats.rolling_sharpe(
             benchmark, rf, period, True, periods_per_year, prepare_returns=False
         )
@@ -886,11 +902,21 @@ def rolling_sortino(
     subtitle=True,
     savefig=None,
     show=True,
+    prepare_returns=True,
 ):
-    returns = _stats.rolling_sortino(returns, rf, period, True, periods_per_year)
+    returns = _stats.rolling_sortino(
+        returns,
+        rf,
+        period,
+        True,
+        periods_per_year,
+        prepare_returns=prepare_returns,
+    )
 
     if benchmark is not None:
-        benchmark = _utils._prepare_benchmark(benchmark, returns.index, rf)
+        benchmark = _utils._prepare_benchmark(
+            benchmark, returns.index, rf, prepare_returns=prepare_returns
+        )
         benchmark = _stats.rolling_sortino(
             benchmark, rf, period, True, periods_per_year, prepare_returns=False
         )
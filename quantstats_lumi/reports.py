@@ -18,13 +18,19 @@
 # See the License for the specific language governing permissions and
 # limitations under the License.
 
+import os as _os
 import re as _regex
 from base64 import b64encode as _b64encode
+from collections import OrderedDict as _OrderedDict
+from concurrent.futures import ProcessPoolExecutor as _ProcessPoolExecutor
 from datetime import datetime as _dt
+from functools import lru_cache as _lru_cache
+from hashlib import blake2b as _blake2b
 from io import StringIO
 from math import ceil as _ceil
 from math import sqrt as _sqrt
 
+import matplotlib as _matplotlib
 import numpy as _np
 import pandas as _pd
 from dateutil.relativedelta import relativedelta
@@ -37,12 +43,55 @@ from . import utils as _utils
 
 try:
     from IPython.display import HTML as iHTML
+    from IPython.display import Image as iImage
     from IPython.display import display as iDisplay
 except ImportError:
     from IPython.core.display import HTML as iHTML
+    from IPython.core.display import Image as iImage
     from IPython.core.display import display as iDisplay
 
 
+# {{placeholder}} markers in the html template
+_PLACEHOLDER_RE = _regex.compile(r"\{\{(.*?)\}\}")
+
+# runs of empty metric rows, rendered as separators
+_EMPTY_ROW_RE = _regex.compile(r"<tr>((?:<td></td>){2,})</tr>")
+
+# padding inside the table cells tabulate outputs
+_CELL_PADDING_RE = _regex.compile(r"(?<=<t[dh]>) +| +(?=</t[dh]>)")
+
+# runs of spaces, collapsed in the html passed to notebook scripts
+_SPACES_RE = _regex.compile(" +")
+
+
+@_lru_cache(maxsize=8)
+def _load_template(path, mtime):
+    """Reads a template file, cached until the file changes"""
+    with open(path) as f:
+        return f.read()
+
+
+def _read_template(path):
+    """Returns the contents of the html template at path"""
+    path = _os.path.realpath(path)
+    return _load_template(path, _os.path.getmtime(path))
+
+
+def _write_template(stream, tpl, subs):
+    """Writes the template to stream, filling in the placeholders"""
+    # split() alternates literal text and placeholder names
+    for i, token in enumerate(_PLACEHOLDER_RE.split(tpl)):
+        if i % 2:
+            token = subs.get(token, "")
+        stream.write(token.replace("white-space:pre;", ""))
+
+
+def _separator_row(match):
+    """Collapses an empty table row into a single <hr> cell"""
+    span = len(match.group(1)) // len("<td></td>")
+    return '<tr><td colspan="{}"><hr></td></tr>'.format(span)
+
+
 def _get_trading_periods(periods_per_year=365):
     """returns trading periods per year and half year"""
     half_year = _ceil(periods_per_year / 2)
@@ -51,10 +100,12 @@ def _get_trading_periods(periods_per_year=365):
 
 def _match_dates(returns, benchmark):
     """match dates of returns and benchmark"""
-    if isinstance(returns, _pd.DataFrame):
-        loc = max(returns[returns.columns[0]].ne(0).idxmax(), benchmark.ne(0).idxmax())
-    else:
-        loc = max(returns.ne(0).idxmax(), benchmark.ne(0).idxmax())
+    strategy = returns.iloc[:, 0] if isinstance(returns, _pd.DataFrame) else returns
+    # first non-zero position of each, as a label of its own index
+    loc = max(
+        strategy.index[(strategy.to_numpy() != 0).argmax()],
+        benchmark.index[(benchmark.to_numpy() != 0).argmax()],
+    )
     returns = returns.loc[loc:]
     benchmark = benchmark.loc[loc:]
 
@@ -77,6 +128,8 @@ def html(
     parameters: dict = None,
     log_scale: bool = False,
     show_match_volatility: bool = True,
+    parallel: bool = False,
+    cache_plots: bool = False,
     **kwargs,
 ):
     """
@@ -103,13 +156,21 @@ def html(
     download_filename : str, optional
         Download filename, default is "tearsheet.html"
     figfmt : str, optional
-        Figure format, default is "svg"
+        Figure format, default is "svg". "png" (or "webp") skips
+        serializing every plot element to xml and renders several
+        times faster for dense plots like the monthly heatmap
     template_path : str, optional
         Custom template path
     match_dates : bool, optional
         Match dates of returns and benchmark, default is True
     parameters : dict, optional
         Strategy parameters
+    parallel : bool, optional
+        Render the plots on a process pool, default is False
+    cache_plots : bool, optional
+        Keep the rendered plots in memory (up to 32 figures) and reuse
+        them in later reports for the same data, options and matplotlib
+        style, default is False
 
     Returns
     -------
@@ -124,14 +185,12 @@ def html(
 
     win_year, win_half_year = _get_trading_periods(periods_per_year)
 
-    tpl = ""
-    with open(template_path or __file__[:-4] + ".html") as f:
-        tpl = f.read()
-        f.close()
+    tpl = _read_template(template_path or __file__[:-4] + ".html")
+
+    # placeholder values, filled into the template in a single pass
+    subs = {}
 
     # prepare timeseries
-    if match_dates:
-        returns = returns.dropna()
     returns = _utils._prepare_returns(returns)
 
     strategy_title = kwargs.get("strategy_title", "Strategy")
@@ -152,19 +211,21 @@ def html(
             elif isinstance(benchmark, _pd.DataFrame):
                 benchmark_title = benchmark[benchmark.columns[0]].name
 
-        tpl = tpl.replace(
-            "{{benchmark_title}}", f"Benchmark is {benchmark_title.upper()} | "
-        )
+        subs["benchmark_title"] = f"Benchmark is {benchmark_title.upper()} | "
         benchmark = _utils._prepare_benchmark(benchmark, returns.index, rf)
         if match_dates is True:
             returns, benchmark = _match_dates(returns, benchmark)
     else:
         benchmark_title = None
 
-    date_range = returns.index.strftime("%e %b, %Y")
-    tpl = tpl.replace("{{date_range}}", date_range[0] + " - " + date_range[-1])
-    tpl = tpl.replace("{{title}}", title)
-    tpl = tpl.replace("{{v}}", __version__)
+    # only the endpoints are shown, don't format the whole index
+    subs["date_range"] = (
+        returns.index[0].strftime("%e %b, %Y")
+        + " - "
+        + returns.index[-1].strftime("%e %b, %Y")
+    )
+    subs["title"] = title
+    subs["v"] = __version__
 
     if benchmark is not None:
         benchmark.name = benchmark_title
@@ -189,7 +250,8 @@ def html(
     )[2:]
 
     mtrx.index.name = "Metric"
-    tpl = tpl.replace("{{metrics}}", _html_table(mtrx))
+    # empty rows separate the metric groups
+    subs["metrics"] = _EMPTY_ROW_RE.sub(_separator_row, _html_table(mtrx))
 
     # Add all of the summary metrics
 
@@ -197,63 +259,47 @@ def html(
     # Get the value of the "Strategy" column where the "Metric" column is "CAGR% (Annual Return)"
     cagr = mtrx.loc["CAGR% (Annual Return)", strategy_title]
     # Add the CAGR to the template
-    tpl = tpl.replace("{{cagr}}", cagr)
+    subs["cagr"] = cagr
 
     # Total Return #
     # Get the value of the "Strategy" column where the "Metric" column is "Total Return"
     total_return = mtrx.loc["Total Return", strategy_title]
     # Add the total return to the template
-    tpl = tpl.replace("{{total_return}}", total_return)
+    subs["total_return"] = total_return
 
 
     # Max Drawdown #
     # Get the value of the "Strategy" column where the "Mteric" column is "Max Drawdown"
     max_drawdown = mtrx.loc["Max Drawdown", strategy_title]
     # Add the max drawdown to the template
-    tpl = tpl.replace("{{max_drawdown}}", max_drawdown)
+    subs["max_drawdown"] = max_drawdown
 
     # RoMaD #
     # Get the value of the "Strategy" column where the "Mteric" column is "RoMaD"
     romad = mtrx.loc["RoMaD", strategy_title]
     # Add the RoMaD to the template
-    tpl = tpl.replace("{{romad}}", romad)
+    subs["romad"] = romad
 
     # Longest Drawdown Duration #
     # Get the value of the "Strategy" column where the "Mteric" column is "Longest Drawdown Duration"
     longest_dd_days = mtrx.loc["Longest DD Days", strategy_title]
     # Add the longest drawdown duration to the template
-    tpl = tpl.replace("{{longest_dd_days}}", longest_dd_days)
+    subs["longest_dd_days"] = longest_dd_days
 
     # Sharpe #
     # Get the value of the "Strategy" column where the "Metric" column is "Sharpe"
     sharpe = mtrx.loc["Sharpe", strategy_title]
     # Add the Sharpe to the template
-    tpl = tpl.replace("{{sharpe}}", sharpe)
+    subs["sharpe"] = sharpe
 
     # Sortino #
     # Get the value of the "Strategy" column where the "Metric" column is "Sortino"
     sortino = mtrx.loc["Sortino", strategy_title]
     # Add the Sharpe to the template
-    tpl = tpl.replace("{{sortino}}", sortino)
-
-
-    if isinstance(returns, _pd.DataFrame):
-        num_cols = len(returns.columns)
-        for i in reversed(range(num_cols + 1, num_cols + 3)):
-            str_td = "<td></td>" * i
-            tpl = tpl.replace(
-                f"<tr>{str_td}</tr>", '<tr><td colspan="{}"><hr></td></tr>'.format(i)
-            )
-
-    tpl = tpl.replace(
-        "<tr><td></td><td></td><td></td></tr>", '<tr><td colspan="3"><hr></td></tr>'
-    )
-    tpl = tpl.replace(
-        "<tr><td></td><td></td></tr>", '<tr><td colspan="2"><hr></td></tr>'
-    )
+    subs["sortino"] = sortino
 
     if parameters is not None:
-        tpl = tpl.replace("{{parameters_section}}", parameters_section(parameters))
+        subs["parameters_section"] = parameters_section(parameters)
 
     if benchmark is not None:
         yoy = _stats.compare(
@@ -262,322 +308,349 @@ def html(
         if isinstance(returns, _pd.Series):
             yoy.columns = [benchmark_title, strategy_title, "Multiplier", "Won"]
         elif isinstance(returns, _pd.DataFrame):
-            yoy.columns = list(
-                _pd.core.common.flatten([benchmark_title, strategy_title])
-            )
+            yoy.columns = _utils._flat1(benchmark_title) + _utils._flat1(strategy_title)
         yoy.index.name = "Year"
-        tpl = tpl.replace("{{eoy_title}}", "<h3>EOY Returns vs Benchmark</h3>")
-        tpl = tpl.replace("{{eoy_table}}", _html_table(yoy))
+        subs["eoy_title"] = "<h3>EOY Returns vs Benchmark</h3>"
+        subs["eoy_table"] = _html_table(yoy)
     else:
         # pct multiplier
         yoy = _pd.DataFrame(_utils.group_returns(returns, returns.index.year) * 100)
         if isinstance(returns, _pd.Series):
             yoy.columns = ["Return"]
             yoy["Cumulative"] = _utils.group_returns(returns, returns.index.year, True)
-            yoy["Return"] = yoy["Return"].round(2).astype(str) + "%"
-            yoy["Cumulative"] = (yoy["Cumulative"] * 100).round(2).astype(str) + "%"
+            # formatted in numpy, without going through object Series
+            for col, pct in (("Return", 1), ("Cumulative", 100)):
+                values = _np.round(yoy[col].to_numpy() * pct, 2)
+                yoy[col] = _np.char.add(values.astype(str), "%")
         elif isinstance(returns, _pd.DataFrame):
             # Don't show cumulative for multiple strategy portfolios
             # just show compounded like when we have a benchmark
-            yoy.columns = list(_pd.core.common.flatten(strategy_title))
+            yoy.columns = _utils._flat1(strategy_title)
 
         yoy.index.name = "Year"
-        tpl = tpl.replace("{{eoy_title}}", "<h3>EOY Returns</h3>")
-        tpl = tpl.replace("{{eoy_table}}", _html_table(yoy))
+        subs["eoy_title"] = "<h3>EOY Returns</h3>"
+        subs["eoy_table"] = _html_table(yoy)
 
+    # drawdowns are computed once, for the table and the drawdown plots
     if isinstance(returns, _pd.Series):
         dd = _stats.to_drawdown_series(returns)
-        dd_info = _stats.drawdown_details(dd).sort_values(
-            by="max drawdown", ascending=True
-        )[:10]
+        dd_details = _stats.drawdown_details(dd)
+        dd_info = dd_details.sort_values(by="max drawdown", ascending=True)[:10]
         dd_info = dd_info[["start", "end", "max drawdown", "days"]]
         dd_info.columns = ["Started", "Recovered", "Drawdown", "Days"]
-        tpl = tpl.replace("{{dd_info}}", _html_table(dd_info, False))
+        subs["dd_info"] = _html_table(dd_info, False)
     elif isinstance(returns, _pd.DataFrame):
+        # every strategy's drawdown series in one vectorized pass
+        dd = _stats.to_drawdown_series(returns)
         dd_info_list = []
+        dd_cache = {}
         for col in returns.columns:
-            dd = _stats.to_drawdown_series(returns[col])
-            dd_info = _stats.drawdown_details(dd).sort_values(
+            dd_cache[col] = dd[col], _stats.drawdown_details(dd[col])
+            dd_info = dd_cache[col][1].sort_values(
                 by="max drawdown", ascending=True
             )[:10]
             dd_info = dd_info[["start", "end", "max drawdown", "days"]]
             dd_info.columns = ["Started", "Recovered", "Drawdown", "Days"]
             dd_info_list.append(_html_table(dd_info, False))
 
-        dd_html_table = ""
-        for html_str, col in zip(dd_info_list, returns.columns):
-            dd_html_table = (
-                dd_html_table + f"<h3>{col}</h3><br>" + StringIO(html_str).read()
-            )
-        tpl = tpl.replace("{{dd_info}}", dd_html_table)
+        subs["dd_info"] = "".join(
+            f"<h3>{col}</h3><br>" + html_str
+            for html_str, col in zip(dd_info_list, returns.columns)
+        )
 
     active = kwargs.get("active_returns", False)
-    # plots
+    # plots, collected as (placeholder, plot function, args, kwargs) jobs
     plot_returns = _plots.log_returns if log_scale else _plots.returns
-    placeholder_returns = "{{log_returns}}" if log_scale else "{{returns}}"
-
-    figfile = _utils._file_stream()
-    plot_returns(
-        returns,
-        benchmark,
-        grayscale=grayscale,
-        figsize=(8, 5),
-        subtitle=False,
-        savefig={"fname": figfile, "format": figfmt},
-        show=False,
-        ylabel=False,
-        cumulative=compounded,
-        prepare_returns=False,
+    placeholder_returns = "log_returns" if log_scale else "returns"
+    jobs = []
+
+    jobs.append(
+        (
+            placeholder_returns,
+            plot_returns,
+            (returns, benchmark),
+            dict(
+                grayscale=grayscale,
+                figsize=(8, 5),
+                subtitle=False,
+                ylabel=False,
+                cumulative=compounded,
+                prepare_returns=False,
+            ),
+        )
     )
-    tpl = tpl.replace(placeholder_returns, _embed_figure(figfile, figfmt))
 
     if benchmark is not None and show_match_volatility:
-        figfile = _utils._file_stream()
-        plot_returns(
-            returns,
-            benchmark,
-            match_volatility=True,
-            grayscale=grayscale,
-            figsize=(8, 5),
-            subtitle=False,
-            savefig={"fname": figfile, "format": figfmt},
-            show=False,
-            ylabel=False,
-            cumulative=compounded,
-            prepare_returns=False,
+        jobs.append(
+            (
+                "vol_returns",
+                plot_returns,
+                (returns, benchmark),
+                dict(
+                    match_volatility=True,
+                    grayscale=grayscale,
+                    figsize=(8, 5),
+                    subtitle=False,
+                    ylabel=False,
+                    cumulative=compounded,
+                    prepare_returns=False,
+                ),
+            )
         )
-        tpl = tpl.replace("{{vol_returns}}", _embed_figure(figfile, figfmt))
 
-    figfile = _utils._file_stream()
-    _plots.yearly_returns(
-        returns,
-        benchmark,
-        grayscale=grayscale,
-        figsize=(8, 4),
-        subtitle=False,
-        savefig={"fname": figfile, "format": figfmt},
-        show=False,
-        ylabel=False,
-        compounded=compounded,
-        prepare_returns=False,
+    jobs.append(
+        (
+            "eoy_returns",
+            _plots.yearly_returns,
+            (returns, benchmark),
+            dict(
+                grayscale=grayscale,
+                figsize=(8, 4),
+                subtitle=False,
+                ylabel=False,
+                compounded=compounded,
+                prepare_returns=False,
+            ),
+        )
     )
-    tpl = tpl.replace("{{eoy_returns}}", _embed_figure(figfile, figfmt))
 
-    figfile = _utils._file_stream()
-    _plots.histogram(
-        returns,
-        benchmark,
-        grayscale=grayscale,
-        figsize=(7, 4),
-        subtitle=False,
-        savefig={"fname": figfile, "format": figfmt},
-        show=False,
-        ylabel=False,
-        compounded=compounded,
-        prepare_returns=False,
+    jobs.append(
+        (
+            "monthly_dist",
+            _plots.histogram,
+            (returns, benchmark),
+            dict(
+                grayscale=grayscale,
+                figsize=(7, 4),
+                subtitle=False,
+                ylabel=False,
+                compounded=compounded,
+                prepare_returns=False,
+            ),
+        )
     )
-    tpl = tpl.replace("{{monthly_dist}}", _embed_figure(figfile, figfmt))
 
-    figfile = _utils._file_stream()
-    _plots.daily_returns(
-        returns,
-        benchmark,
-        grayscale=grayscale,
-        figsize=(8, 3),
-        subtitle=False,
-        savefig={"fname": figfile, "format": figfmt},
-        show=False,
-        ylabel=False,
-        prepare_returns=False,
-        active=active,
+    jobs.append(
+        (
+            "daily_returns",
+            _plots.daily_returns,
+            (returns, benchmark),
+            dict(
+                grayscale=grayscale,
+                figsize=(8, 3),
+                subtitle=False,
+                ylabel=False,
+                prepare_returns=False,
+                active=active,
+            ),
+        )
     )
-    tpl = tpl.replace("{{daily_returns}}", _embed_figure(figfile, figfmt))
 
     if benchmark is not None:
-        figfile = _utils._file_stream()
-        _plots.rolling_beta(
-            returns,
-            benchmark,
-            grayscale=grayscale,
-            figsize=(8, 3),
-            subtitle=False,
-            window1=win_half_year,
-            window2=win_year,
-            savefig={"fname": figfile, "format": figfmt},
-            show=False,
-            ylabel=False,
-            prepare_returns=False,
+        jobs.append(
+            (
+                "rolling_beta",
+                _plots.rolling_beta,
+                (returns, benchmark),
+                dict(
+                    grayscale=grayscale,
+                    figsize=(8, 3),
+                    subtitle=False,
+                    window1=win_half_year,
+                    window2=win_year,
+                    ylabel=False,
+                    prepare_returns=False,
+                ),
+            )
         )
-        tpl = tpl.replace("{{rolling_beta}}", _embed_figure(figfile, figfmt))
 
-    figfile = _utils._file_stream()
-    _plots.rolling_volatility(
-        returns,
-        benchmark,
-        grayscale=grayscale,
-        figsize=(8, 3),
-        subtitle=False,
-        savefig={"fname": figfile, "format": figfmt},
-        show=False,
-        ylabel=False,
-        period=win_half_year,
-        periods_per_year=win_year,
+    jobs.append(
+        (
+            "rolling_vol",
+            _plots.rolling_volatility,
+            (returns, benchmark),
+            dict(
+                grayscale=grayscale,
+                figsize=(8, 3),
+                subtitle=False,
+                ylabel=False,
+                period=win_half_year,
+                periods_per_year=win_year,
+                prepare_returns=False,
+            ),
+        )
     )
-    tpl = tpl.replace("{{rolling_vol}}", _embed_figure(figfile, figfmt))
 
-    figfile = _utils._file_stream()
-    _plots.rolling_sharpe(
-        returns,
-        grayscale=grayscale,
-        figsize=(8, 3),
-        subtitle=False,
-        savefig={"fname": figfile, "format": figfmt},
-        show=False,
-        ylabel=False,
-        period=win_half_year,
-        periods_per_year=win_year,
+    jobs.append(
+        (
+            "rolling_sharpe",
+            _plots.rolling_sharpe,
+            (returns,),
+            dict(
+                grayscale=grayscale,
+                figsize=(8, 3),
+                subtitle=False,
+                ylabel=False,
+                period=win_half_year,
+                periods_per_year=win_year,
+                prepare_returns=False,
+            ),
+        )
     )
-    tpl = tpl.replace("{{rolling_sharpe}}", _embed_figure(figfile, figfmt))
 
-    figfile = _utils._file_stream()
-    _plots.rolling_sortino(
-        returns,
-        grayscale=grayscale,
-        figsize=(8, 3),
-        subtitle=False,
-        savefig={"fname": figfile, "format": figfmt},
-        show=False,
-        ylabel=False,
-        period=win_half_year,
-        periods_per_year=win_year,
+    jobs.append(
+        (
+            "rolling_sortino",
+            _plots.rolling_sortino,
+            (returns,),
+            dict(
+                grayscale=grayscale,
+                figsize=(8, 3),
+                subtitle=False,
+                ylabel=False,
+                period=win_half_year,
+                periods_per_year=win_year,
+                prepare_returns=False,
+            ),
+        )
     )
-    tpl = tpl.replace("{{rolling_sortino}}", _embed_figure(figfile, figfmt))
 
-    figfile = _utils._file_stream()
     if isinstance(returns, _pd.Series):
-        _plots.drawdowns_periods(
-            returns,
-            grayscale=grayscale,
-            figsize=(8, 4),
-            subtitle=False,
-            title=returns.name,
-            savefig={"fname": figfile, "format": figfmt},
-            show=False,
-            ylabel=False,
-            compounded=compounded,
-            prepare_returns=False,
-            log_scale=log_scale,
+        jobs.append(
+            (
+                "dd_periods",
+                _plots.drawdowns_periods,
+                (returns,),
+                dict(
+                    grayscale=grayscale,
+                    figsize=(8, 4),
+                    subtitle=False,
+                    title=returns.name,
+                    ylabel=False,
+                    compounded=compounded,
+                    prepare_returns=False,
+                    log_scale=log_scale,
+                    dd=dd,
+                    dd_details=dd_details,
+                ),
+            )
         )
-        tpl = tpl.replace("{{dd_periods}}", _embed_figure(figfile, figfmt))
     elif isinstance(returns, _pd.DataFrame):
-        embed = []
         for col in returns.columns:
-            _plots.drawdowns_periods(
-                returns[col],
-                grayscale=grayscale,
-                figsize=(8, 4),
-                subtitle=False,
-                title=col,
-                savefig={"fname": figfile, "format": figfmt},
-                show=False,
-                ylabel=False,
-                compounded=compounded,
-                prepare_returns=False,
+            jobs.append(
+                (
+                    "dd_periods",
+                    _plots.drawdowns_periods,
+                    (returns[col],),
+                    dict(
+                        grayscale=grayscale,
+                        figsize=(8, 4),
+                        subtitle=False,
+                        title=col,
+                        ylabel=False,
+                        compounded=compounded,
+                        prepare_returns=False,
+                        dd=dd_cache[col][0],
+                        dd_details=dd_cache[col][1],
+                    ),
+                )
             )
-            embed.append(figfile)
-        tpl = tpl.replace("{{dd_periods}}", _embed_figure(embed, figfmt))
 
-    figfile = _utils._file_stream()
-    _plots.drawdown(
-        returns,
-        grayscale=grayscale,
-        figsize=(8, 3),
-        subtitle=False,
-        savefig={"fname": figfile, "format": figfmt},
-        show=False,
-        ylabel=False,
+    jobs.append(
+        (
+            "dd_plot",
+            _plots.drawdown,
+            (returns,),
+            dict(
+                grayscale=grayscale, figsize=(8, 3), subtitle=False, ylabel=False, dd=dd
+            ),
+        )
     )
-    tpl = tpl.replace("{{dd_plot}}", _embed_figure(figfile, figfmt))
 
-    figfile = _utils._file_stream()
     if isinstance(returns, _pd.Series):
-        _plots.monthly_heatmap(
-            returns,
-            benchmark,
-            grayscale=grayscale,
-            figsize=(8, 4),
-            cbar=False,
-            returns_label=returns.name,
-            savefig={"fname": figfile, "format": figfmt},
-            show=False,
-            ylabel=False,
-            compounded=compounded,
-            active=active,
+        jobs.append(
+            (
+                "monthly_heatmap",
+                _plots.monthly_heatmap,
+                (returns, benchmark),
+                dict(
+                    grayscale=grayscale,
+                    figsize=(8, 4),
+                    cbar=False,
+                    returns_label=returns.name,
+                    ylabel=False,
+                    compounded=compounded,
+                    active=active,
+                ),
+            )
         )
-        tpl = tpl.replace("{{monthly_heatmap}}", _embed_figure(figfile, figfmt))
     elif isinstance(returns, _pd.DataFrame):
-        embed = []
         for col in returns.columns:
-            _plots.monthly_heatmap(
-                returns[col],
-                benchmark,
-                grayscale=grayscale,
-                figsize=(8, 4),
-                cbar=False,
-                returns_label=col,
-                savefig={"fname": figfile, "format": figfmt},
-                show=False,
-                ylabel=False,
-                compounded=compounded,
-                active=active,
+            jobs.append(
+                (
+                    "monthly_heatmap",
+                    _plots.monthly_heatmap,
+                    (returns[col], benchmark),
+                    dict(
+                        grayscale=grayscale,
+                        figsize=(8, 4),
+                        cbar=False,
+                        returns_label=col,
+                        ylabel=False,
+                        compounded=compounded,
+                        active=active,
+                    ),
+                )
             )
-            embed.append(figfile)
-        tpl = tpl.replace("{{monthly_heatmap}}", _embed_figure(embed, figfmt))
-
-    figfile = _utils._file_stream()
 
     if isinstance(returns, _pd.Series):
-        _plots.distribution(
-            returns,
-            grayscale=grayscale,
-            figsize=(8, 4),
-            subtitle=False,
-            title=returns.name,
-            savefig={"fname": figfile, "format": figfmt},
-            show=False,
-            ylabel=False,
-            compounded=compounded,
-            prepare_returns=False,
+        jobs.append(
+            (
+                "returns_dist",
+                _plots.distribution,
+                (returns,),
+                dict(
+                    grayscale=grayscale,
+                    figsize=(8, 4),
+                    subtitle=False,
+                    title=returns.name,
+                    ylabel=False,
+                    compounded=compounded,
+                    prepare_returns=False,
+                ),
+            )
         )
-        tpl = tpl.replace("{{returns_dist}}", _embed_figure(figfile, figfmt))
     elif isinstance(returns, _pd.DataFrame):
-        embed = []
         for col in returns.columns:
-            _plots.distribution(
-                returns[col],
-                grayscale=grayscale,
-                figsize=(8, 4),
-                subtitle=False,
-                title=col,
-                savefig={"fname": figfile, "format": figfmt},
-                show=False,
-                ylabel=False,
-                compounded=compounded,
-                prepare_returns=False,
+            jobs.append(
+                (
+                    "returns_dist",
+                    _plots.distribution,
+                    (returns[col],),
+                    dict(
+                        grayscale=grayscale,
+                        figsize=(8, 4),
+                        subtitle=False,
+                        title=col,
+                        ylabel=False,
+                        compounded=compounded,
+                        prepare_returns=False,
+                    ),
+                )
             )
-            embed.append(figfile)
-        tpl = tpl.replace("{{returns_dist}}", _embed_figure(embed, figfmt))
 
-    tpl = _regex.sub(r"\{\{(.*?)\}\}", "", tpl)
-    tpl = tpl.replace("white-space:pre;", "")
+    subs.update(_render_plots(jobs, figfmt, parallel, cache_plots))
 
     if output is None:
-        # _open_html(tpl)
-        _download_html(tpl, download_filename)
+        html_stream = StringIO()
+        _write_template(html_stream, tpl, subs)
+        # _open_html(html_stream.getvalue())
+        _download_html(html_stream.getvalue(), download_filename)
         return
 
+    # streamed piece by piece, the filled report is never held in full
     with open(output, "w", encoding="utf-8") as f:
-        f.write(tpl)
+        _write_template(f, tpl, subs)
 
     print(f"HTML report saved to: {output}")
 
@@ -631,18 +704,19 @@ def full(
     dd = _stats.to_drawdown_series(returns)
 
     if isinstance(dd, _pd.Series):
-        col = _stats.drawdown_details(dd).columns[4]
-        dd_info = _stats.drawdown_details(dd).sort_values(by=col, ascending=True)[:5]
+        dd_info = _stats.drawdown_details(dd)
+        col = dd_info.columns[4]
+        dd_info = dd_info.sort_values(by=col, ascending=True)[:5]
         if not dd_info.empty:
             dd_info.index = range(1, min(6, len(dd_info) + 1))
             dd_info.columns = map(lambda x: str(x).title(), dd_info.columns)
     elif isinstance(dd, _pd.DataFrame):
-        col = _stats.drawdown_details(dd).columns.get_level_values(1)[4]
         dd_info_dict = {}
         for ptf in dd.columns:
-            dd_info = _stats.drawdown_details(dd[ptf]).sort_values(
-                by=col, ascending=True
-            )[:5]
+            # every strategy's details share the same columns
+            dd_info = _stats.drawdown_details(dd[ptf])
+            col = dd_info.columns[4]
+            dd_info = dd_info.sort_values(by=col, ascending=True)[:5]
             if not dd_info.empty:
                 dd_info.index = range(1, min(6, len(dd_info) + 1))
                 dd_info.columns = map(lambda x: str(x).title(), dd_info.columns)
@@ -832,14 +906,15 @@ def parameters_section(parameters):
     """
 
     # Add titles to the table
-    tpl += "<thead><tr><th>Parameter</th><th>Value</th></tr></thead>"
+    rows = ["<thead><tr><th>Parameter</th><th>Value</th></tr></thead>"]
 
     for key, value in parameters.items():
         # Make sure that the value is something that can be displayed
         if not isinstance(value, (int, float, str)):
             value = str(value)
 
-        tpl += f"<tr><td>{key}</td><td>{value}</td></tr>"
+        rows.append(f"<tr><td>{key}</td><td>{value}</td></tr>")
+    tpl += "".join(rows)
     tpl += """
         </table>
     </div>
@@ -847,6 +922,58 @@ def parameters_section(parameters):
 
     return tpl
 
+# recently computed metrics tables, see metrics()
+_METRICS_CACHE = _OrderedDict()
+_METRICS_CACHE_SIZE = 4
+
+
+def _data_digest(data, labels=True):
+    """Content hash of a Series / DataFrame, including its labels"""
+    digest = _blake2b(digest_size=16)
+    digest.update(_pd.util.hash_pandas_object(data).to_numpy().tobytes())
+    if labels:
+        labels = data.name if isinstance(data, _pd.Series) else list(data.columns)
+    digest.update(repr((labels, str(data.index.dtype))).encode())
+    return digest.digest()
+
+
+# inf and the strings of nan / inf cells, see _metrics()' cleanups
+_MISSING_VALUES = [
+    _np.inf,
+    -_np.inf,
+    "-nan%",
+    "nan%",
+    "-nan",
+    "nan",
+    "-inf%",
+    "inf%",
+    "-inf",
+    "inf",
+]
+
+
+def _metrics_cache_key(returns, benchmark, rf, **params):
+    """Returns the metrics() cache key, or None when not cacheable"""
+    if not isinstance(rf, (int, float)):
+        return None
+    if not isinstance(returns, (_pd.Series, _pd.DataFrame)):
+        return None
+    if benchmark is not None:
+        # ticker benchmarks are downloaded, and can change
+        if not isinstance(benchmark, (_pd.Series, _pd.DataFrame)):
+            return None
+        # series are renamed in _metrics(), so their names don't matter
+        benchmark = _data_digest(
+            benchmark, labels=not isinstance(benchmark, _pd.Series)
+        )
+    return (
+        _data_digest(returns, labels=not isinstance(returns, _pd.Series)),
+        benchmark,
+        rf,
+        repr(sorted(params.items())),
+    )
+
+
 def metrics(
     returns,
     benchmark=None,
@@ -861,14 +988,160 @@ def metrics(
     **kwargs,
 ):
     """calculates and displays various performance metrics"""
+    # formatted for display, also when embedded in the html report
+    params = dict(
+        mode=mode,
+        compounded=compounded,
+        periods_per_year=periods_per_year,
+        prepare_returns=prepare_returns,
+        match_dates=match_dates,
+        as_text=display or "internal" in kwargs,
+        as_pct=kwargs.get("as_pct", False),
+        benchmark_title=kwargs.get("benchmark_title", "Benchmark"),
+        strategy_title=kwargs.get("strategy_title", "Strategy"),
+    )
+
+    # the table is cached before it's displayed or trimmed, so
+    # full() and html() for the same returns compute it only once
+    key = _metrics_cache_key(returns, benchmark, rf, **params)
+    if key is not None and key in _METRICS_CACHE:
+        _METRICS_CACHE.move_to_end(key)
+        metrics = _METRICS_CACHE[key].copy()
+    else:
+        metrics = _metrics(returns, benchmark=benchmark, rf=rf, **params)
+        if key is not None:
+            _METRICS_CACHE[key] = metrics.copy()
+            while len(_METRICS_CACHE) > _METRICS_CACHE_SIZE:
+                _METRICS_CACHE.popitem(last=False)
+
+    if display:
+        print(_tabulate(metrics, headers="keys", tablefmt="simple"))
+        return None
+
+    if not sep:
+        metrics = metrics[metrics.index != ""]
+
+    # remove spaces from the metric names (rows, after the transpose)
+    metrics.index = [
+        c.replace(" %", "").replace(" *int", "").strip() for c in metrics.index
+    ]
+
+    return metrics
+
+
+def _compute_moments(df):
+    """
+    Per column mean, std, skew, kurtosis, min and max of the (nan free)
+    metrics frame, sharing one pass of deviations from the mean
+    """
+    values = df.to_numpy(dtype=_np.float64)
+    # a float count, so n < 4 divides to inf/nan instead of raising
+    count = _np.float64(values.shape[0])
+    with _np.errstate(invalid="ignore", divide="ignore"):
+        mean = values.sum(axis=0) / count
+        adjusted = values - mean
+        adjusted2 = adjusted**2
+        m2 = adjusted2.sum(axis=0)
+        m3 = (adjusted2 * adjusted).sum(axis=0)
+        m4 = (adjusted2**2).sum(axis=0)
+
+        # same bias corrections and fp noise cut-off as pandas' skew()
+        # and kurtosis(), so the table doesn't change
+        def _zero_fperr(x):
+            return _np.where(_np.abs(x) < 1e-14, 0, x)
+
+        skew_m2 = _zero_fperr(m2)
+        skew = (count * (count - 1) ** 0.5 / (count - 2)) * (
+            _zero_fperr(m3) / skew_m2**1.5
+        )
+        skew = _np.where(skew_m2 == 0, 0, skew)
+
+        numerator = _zero_fperr(count * (count + 1) * (count - 1) * m4)
+        denominator = _zero_fperr((count - 2) * (count - 3) * m2**2)
+        adj = 3 * (count - 1) ** 2 / ((count - 2) * (count - 3))
+        kurt = _np.where(denominator == 0, 0, numerator / denominator - adj)
+
+        std = _np.sqrt(m2 / (count - 1))
+
+    if count < 3:
+        skew[:] = _np.nan
+    if count < 4:
+        kurt[:] = _np.nan
+
+    moments = {
+        "mean": mean,
+        "std": std,
+        "skew": skew,
+        "kurt": kurt,
+        "min": values.min(axis=0),
+        "max": values.max(axis=0),
+    }
+    return {name: _pd.Series(v, index=df.columns) for name, v in moments.items()}
+
+
+def _benchmark_stats(df, columns, periods):
+    """
+    Beta, alpha, correlation, r^2 and information ratio of each of the
+    columns to df["benchmark"], in one go over the stacked columns
+    """
+    strategies = df[columns].to_numpy(dtype=_np.float64)
+    bench = df["benchmark"].to_numpy(dtype=_np.float64)
+    strategies_c = strategies - strategies.mean(axis=0)
+    bench_c = bench - bench.mean()
+    with _np.errstate(divide="ignore", invalid="ignore"):
+        cov = bench_c @ strategies_c
+        bench_ss = bench_c @ bench_c
+        beta = cov / bench_ss
+        alpha = (strategies.mean(axis=0) - beta * bench.mean()) * periods
+        corr = _np.clip(cov / _np.sqrt((strategies_c**2).sum(axis=0) * bench_ss), -1, 1)
+        diff = strategies - bench[:, None]
+        information_ratio = diff.mean(axis=0) / diff.std(axis=0, ddof=1)
+
+    # same corner cases as stats.r_squared()
+    r2 = corr**2
+    if df.index.nunique() == 1 or (bench == bench[0]).all():
+        r2[:] = 0
+
+    return {
+        # nan filled like stats.greeks()
+        "beta": _np.where(_np.isnan(beta), 0, beta),
+        "alpha": _np.where(_np.isnan(alpha), 0, alpha),
+        "corr": corr,
+        "r2": r2,
+        "information_ratio": information_ratio,
+    }
+
+
+def _metrics(
+    returns,
+    benchmark=None,
+    rf=0.0,
+    mode="basic",
+    compounded=True,
+    periods_per_year=365,
+    prepare_returns=True,
+    match_dates=True,
+    as_text=True,
+    as_pct=False,
+    benchmark_title="Benchmark",
+    strategy_title="Strategy",
+):
+    """Computes the metrics() table, before it's displayed or trimmed"""
 
     if match_dates:
         returns = returns.dropna()
-    returns.index = returns.index.tz_localize(None)
+    if getattr(returns.index, "tz", None) is not None:
+        # shallow copy, so the caller's index is left alone
+        returns = returns.copy(deep=False)
+        returns.index = returns.index.tz_localize(None)
     win_year, _ = _get_trading_periods(periods_per_year)
 
-    benchmark_colname = kwargs.get("benchmark_title", "Benchmark")
-    strategy_colname = kwargs.get("strategy_title", "Strategy")
+    full_mode = mode.lower() == "full"
+    is_series = isinstance(returns, _pd.Series)
+    is_frame = isinstance(returns, _pd.DataFrame)
+
+    benchmark_colname = benchmark_title
+    strategy_colname = strategy_title
 
     if benchmark is not None:
         if isinstance(benchmark, str):
@@ -879,73 +1152,82 @@ def metrics(
                 "but a multi-column DataFrame was passed"
             )
 
-    if isinstance(returns, _pd.DataFrame):
-        if len(returns.columns) > 1:
-            blank = [""] * len(returns.columns)
-            if isinstance(strategy_colname, str):
-                strategy_colname = list(returns.columns)
+    if is_frame:
+        blank = [""] * len(returns.columns)
+        if len(returns.columns) > 1 and isinstance(strategy_colname, str):
+            strategy_colname = list(returns.columns)
     else:
         blank = [""]
 
     if prepare_returns:
-        df = _utils._prepare_returns(returns)
+        returns = _utils._prepare_returns(returns)
 
-    if isinstance(returns, _pd.Series):
-        df = _pd.DataFrame({"returns": returns})
-    elif isinstance(returns, _pd.DataFrame):
-        df = _pd.DataFrame(
-            {
-                "returns_" + str(i + 1): returns[strategy_col]
-                for i, strategy_col in enumerate(returns.columns)
-            }
-        )
+    # rows of matched out dates are kept (zero filled below)
+    index = returns.index
 
     if benchmark is not None:
         benchmark = _utils._prepare_benchmark(benchmark, returns.index, rf)
         if match_dates is True:
             returns, benchmark = _match_dates(returns, benchmark)
-        df["benchmark"] = benchmark
-        if isinstance(returns, _pd.Series):
+        if is_series:
             blank = ["", ""]
-            df["returns"] = returns
-        elif isinstance(returns, _pd.DataFrame):
+        elif is_frame:
             blank = [""] * len(returns.columns) + [""]
-            for i, strategy_col in enumerate(returns.columns):
-                df["returns_" + str(i + 1)] = returns[strategy_col]
 
-    if isinstance(returns, _pd.Series):
-        s_start = {"returns": df["returns"].index.strftime("%Y-%m-%d")[0]}
-        s_end = {"returns": df["returns"].index.strftime("%Y-%m-%d")[-1]}
+    # built in one go, rather than inserting a column at a time
+    if is_series:
+        columns = [returns.rename("returns")]
+    elif is_frame:
+        columns = [
+            returns.set_axis(
+                ["returns_" + str(i + 1) for i in range(len(returns.columns))],
+                axis=1,
+            )
+        ]
+    if benchmark is not None:
+        columns.append(benchmark.rename("benchmark"))
+    df = _pd.concat(columns, axis=1)
+    if not df.index.equals(index):
+        df = df.reindex(index)
+
+    if is_series:
+        s_start = {"returns": df.index[0].strftime("%Y-%m-%d")}
+        s_end = {"returns": df.index[-1].strftime("%Y-%m-%d")}
         s_rf = {"returns": rf}
-    elif isinstance(returns, _pd.DataFrame):
+    elif is_frame:
         df_strategy_columns = [col for col in df.columns if col != "benchmark"]
         s_start = {
-            strategy_col: df[strategy_col].dropna().index.strftime("%Y-%m-%d")[0]
+            strategy_col: df[strategy_col].first_valid_index().strftime("%Y-%m-%d")
             for strategy_col in df_strategy_columns
         }
         s_end = {
-            strategy_col: df[strategy_col].dropna().index.strftime("%Y-%m-%d")[-1]
+            strategy_col: df[strategy_col].last_valid_index().strftime("%Y-%m-%d")
             for strategy_col in df_strategy_columns
         }
         s_rf = {strategy_col: rf for strategy_col in df_strategy_columns}
 
     if "benchmark" in df:
-        s_start["benchmark"] = df["benchmark"].index.strftime("%Y-%m-%d")[0]
-        s_end["benchmark"] = df["benchmark"].index.strftime("%Y-%m-%d")[-1]
+        s_start["benchmark"] = df.index[0].strftime("%Y-%m-%d")
+        s_end["benchmark"] = df.index[-1].strftime("%Y-%m-%d")
         s_rf["benchmark"] = rf
 
-    df = df.fillna(0)
+    # everything below works off the same prepared frame, df was built
+    # from copies of the inputs above so it's safe to fill in place
+    df.fillna(0, inplace=True)
+    df = _utils._mark_prepared(df)
 
     # pct multiplier
-    pct = 100 if display or "internal" in kwargs else 1
-    if kwargs.get("as_pct", False):
-        pct = 100
+    pct = 100 if as_text or as_pct else 1
+
+    # one drawdown series for the dd table and every dd based ratio
+    drawdown = _stats.to_drawdown_series(df)
 
     # return df
     dd = _calc_dd(
         df,
-        display=(display or "internal" in kwargs),
-        as_pct=kwargs.get("as_pct", False),
+        display=as_text,
+        as_pct=as_pct,
+        dd=drawdown,
     )
 
     metrics = _pd.DataFrame()
@@ -965,23 +1247,32 @@ def metrics(
 
     metrics["~~~~~~~~~~~~~~"] = blank
 
-    metrics["Sharpe"] = _stats.sharpe(df, rf, win_year, True)
-    metrics["RoMaD"] = _stats.romad(df, win_year, True)
+    # shared by the volatility, skew, kurtosis, var and best/worst day rows
+    moments = _compute_moments(df)
+
+    # one pass over the excess returns for sharpe and sortino
+    mean, std, downside, _ = _stats._moments(
+        _utils._prepare_returns(df, rf, win_year)
+    )
+    vol = moments["std"] * _sqrt(win_year) * pct
+
+    metrics["Sharpe"] = mean / std * _sqrt(win_year)
+    metrics["RoMaD"] = _stats.romad(df, win_year, True, dd=drawdown)
 
     if benchmark is not None:
         metrics["Corr to Benchmark "] = _stats.benchmark_correlation(df, benchmark, True)
     metrics["Prob. Sharpe Ratio %"] = (
         _stats.probabilistic_sharpe_ratio(df, rf, win_year, False) * pct
     )
-    if mode.lower() == "full":
+    if full_mode:
         metrics["Smart Sharpe"] = _stats.smart_sharpe(df, rf, win_year, True)
 
-    metrics["Sortino"] = _stats.sortino(df, rf, win_year, True)
-    if mode.lower() == "full":
+    metrics["Sortino"] = mean / downside * _sqrt(win_year)
+    if full_mode:
         metrics["Smart Sortino"] = _stats.smart_sortino(df, rf, win_year, True)
 
     metrics["Sortino/√2"] = metrics["Sortino"] / _sqrt(2)
-    if mode.lower() == "full":
+    if full_mode:
         metrics["Smart Sortino/√2"] = metrics["Smart Sortino"] / _sqrt(2)
     metrics["Omega"] = _stats.omega(df, rf, 0.0, win_year)
 
@@ -989,67 +1280,42 @@ def metrics(
     metrics["Max Drawdown %"] = blank
     metrics["Longest DD Days"] = blank
 
-    if mode.lower() == "full":
-        if isinstance(returns, _pd.Series):
-            ret_vol = (
-                _stats.volatility(df["returns"], win_year, True, prepare_returns=False)
-                * pct
-            )
-        elif isinstance(returns, _pd.DataFrame):
-            ret_vol = [
-                _stats.volatility(
-                    df[strategy_col], win_year, True, prepare_returns=False
-                )
-                * pct
-                for strategy_col in df_strategy_columns
-            ]
+    if full_mode:
+        if is_series:
+            ret_vol = vol["returns"]
+        elif is_frame:
+            ret_vol = [vol[strategy_col] for strategy_col in df_strategy_columns]
         if "benchmark" in df:
-            bench_vol = (
-                _stats.volatility(
-                    df["benchmark"], win_year, True, prepare_returns=False
-                )
-                * pct
-            )
+            bench_vol = vol["benchmark"]
 
-            vol_ = [ret_vol, bench_vol]
-            if isinstance(ret_vol, list):
-                metrics["Volatility (ann.) %"] = list(_pd.core.common.flatten(vol_))
-            else:
-                metrics["Volatility (ann.) %"] = vol_
+            metrics["Volatility (ann.) %"] = _utils._flat1(ret_vol) + [bench_vol]
 
-            if isinstance(returns, _pd.Series):
-                metrics["R^2"] = _stats.r_squared(
-                    df["returns"], df["benchmark"], prepare_returns=False
-                )
-                metrics["Information Ratio"] = _stats.information_ratio(
-                    df["returns"], df["benchmark"], prepare_returns=False
-                )
-            elif isinstance(returns, _pd.DataFrame):
-                metrics["R^2"] = (
-                    [
-                        _stats.r_squared(
-                            df[strategy_col], df["benchmark"], prepare_returns=False
-                        ).round(2)
-                        for strategy_col in df_strategy_columns
-                    ]
-                ) + ["-"]
-                metrics["Information Ratio"] = (
-                    [
-                        _stats.information_ratio(
-                            df[strategy_col], df["benchmark"], prepare_returns=False
-                        ).round(2)
-                        for strategy_col in df_strategy_columns
-                    ]
+            # every strategy against the benchmark at once,
+            # also used for the greeks further down
+            if is_series:
+                bench_columns = ["returns"]
+            else:
+                bench_columns = df_strategy_columns
+            bench_stats = _benchmark_stats(df, bench_columns, win_year)
+            if is_series:
+                metrics["R^2"] = bench_stats["r2"][0]
+                metrics["Information Ratio"] = bench_stats["information_ratio"][0]
+            elif is_frame:
+                metrics["R^2"] = list(_np.round(bench_stats["r2"], 2)) + ["-"]
+                metrics["Information Ratio"] = list(
+                    _np.round(bench_stats["information_ratio"], 2)
                 ) + ["-"]
         else:
-            if isinstance(returns, _pd.Series):
+            if is_series:
                 metrics["Volatility (ann.) %"] = [ret_vol]
-            elif isinstance(returns, _pd.DataFrame):
+            elif is_frame:
                 metrics["Volatility (ann.) %"] = ret_vol
 
-        metrics["Calmar"] = _stats.calmar(df, prepare_returns=False, periods=win_year)
-        metrics["Skew"] = _stats.skew(df, prepare_returns=False)
-        metrics["Kurtosis"] = _stats.kurtosis(df, prepare_returns=False)
+        metrics["Calmar"] = _stats.calmar(
+            df, prepare_returns=False, periods=win_year, dd=drawdown
+        )
+        metrics["Skew"] = moments["skew"]
+        metrics["Kurtosis"] = moments["kurt"]
 
         metrics["~~~~~~~~~~"] = blank
 
@@ -1070,9 +1336,10 @@ def metrics(
             * pct
         )
 
-        metrics["Daily Value-at-Risk %"] = -abs(
-            _stats.var(df, prepare_returns=False) * pct
-        )
+        # variance-covariance var (see stats.value_at_risk)
+        value_at_risk = moments["mean"] + moments["std"] * _stats._z_score(1 - 0.95)
+        value_at_risk[~(moments["std"] > 0)] = _np.nan
+        metrics["Daily Value-at-Risk %"] = -abs(value_at_risk * pct)
         metrics["Expected Shortfall (cVaR) %"] = -abs(
             _stats.cvar(df, prepare_returns=False) * pct
         )
@@ -1082,43 +1349,53 @@ def metrics(
     comp_func = _stats.comp if compounded else lambda x: _np.sum(x, axis=0)
 
     today = df.index[-1]  # _dt.today()
-    metrics["MTD %"] = comp_func(df[df.index >= _dt(today.year, today.month, 1)]) * pct
-
-    d = today - relativedelta(months=3)
-    metrics["3M %"] = comp_func(df[df.index >= d]) * pct
-
-    d = today - relativedelta(months=6)
-    metrics["6M %"] = comp_func(df[df.index >= d]) * pct
-
-    metrics["YTD %"] = comp_func(df[df.index >= _dt(today.year, 1, 1)]) * pct
-
-    d = today - relativedelta(years=1)
-    metrics["1Y %"] = comp_func(df[df.index >= d]) * pct
-
-    d = today - relativedelta(months=35)
-    metrics["3Y (ann.) %"] = (
-        _stats.cagr(df[df.index >= d], 0.0, compounded, win_year) * pct
-    )
-
-    d = today - relativedelta(months=59)
-    metrics["5Y (ann.) %"] = (
-        _stats.cagr(df[df.index >= d], 0.0, compounded, win_year) * pct
-    )
+    sorted_index = df.index.is_monotonic_increasing
+
+    # (row, start date) per trailing window, the (ann.) ones are CAGRs
+    windows = [
+        ("MTD %", _dt(today.year, today.month, 1)),
+        ("3M %", today - relativedelta(months=3)),
+        ("6M %", today - relativedelta(months=6)),
+        ("YTD %", _dt(today.year, 1, 1)),
+        ("1Y %", today - relativedelta(years=1)),
+        ("3Y (ann.) %", today - relativedelta(months=35)),
+        ("5Y (ann.) %", today - relativedelta(months=59)),
+        ("10Y (ann.) %", today - relativedelta(years=10)),
+        ("All-time (ann.) %", df.index.min()),
+    ]
 
-    d = today - relativedelta(years=10)
-    metrics["10Y (ann.) %"] = (
-        _stats.cagr(df[df.index >= d], 0.0, compounded, win_year) * pct
-    )
+    if sorted_index:
+        # every window is a tail of df, so one reverse cumulative product
+        # (or sum) holds each window's total at its first row
+        values = df.to_numpy(dtype=float)[::-1]
+        if compounded:
+            trailing = _np.cumprod(values + 1.0, axis=0)[::-1] - 1.0
+        else:
+            trailing = _np.cumsum(values, axis=0)[::-1]
+        starts = df.index.searchsorted([date for _, date in windows])
+
+    for i, (row, date) in enumerate(windows):
+        annualized = "(ann.)" in row
+        if not sorted_index:
+            window = df[df.index >= date]
+            if annualized:
+                metrics[row] = _stats.cagr(window, 0.0, compounded, win_year) * pct
+            else:
+                metrics[row] = comp_func(window) * pct
+            continue
 
-    metrics["All-time (ann.) %"] = _stats.cagr(df, 0.0, compounded, win_year) * pct
+        # same as comp_func() / _stats.cagr() of the window
+        total = _pd.Series(trailing[starts[i]], index=df.columns)
+        if annualized:
+            years = (df.index[-1] - df.index[starts[i]]).days / win_year
+            total = abs(total + 1.0) ** (1.0 / years) - 1
+        metrics[row] = total * pct
 
     # best/worst
-    if mode.lower() == "full":
+    if full_mode:
         metrics["~~~"] = blank
-        metrics["Best Day %"] = (
-            _stats.best(df, compounded=compounded, prepare_returns=False) * pct
-        )
-        metrics["Worst Day %"] = _stats.worst(df, prepare_returns=False) * pct
+        metrics["Best Day %"] = moments["max"] * pct
+        metrics["Worst Day %"] = moments["min"] * pct
         metrics["Best Month %"] = (
             _stats.best(
                 df, compounded=compounded, aggregate="ME", prepare_returns=False
@@ -1145,12 +1422,12 @@ def metrics(
     metrics["~~~~"] = blank
     for ix, row in dd.iterrows():
         metrics[ix] = row
-    metrics["Recovery Factor"] = _stats.recovery_factor(df)
-    metrics["Ulcer Index"] = _stats.ulcer_index(df)
-    metrics["Serenity Index"] = _stats.serenity_index(df, rf)
+    metrics["Recovery Factor"] = _stats.recovery_factor(df, dd=drawdown)
+    metrics["Ulcer Index"] = _stats.ulcer_index(df, dd=drawdown)
+    metrics["Serenity Index"] = _stats.serenity_index(df, rf, dd=drawdown)
 
     # win rate
-    if mode.lower() == "full":
+    if full_mode:
         metrics["~~~~~"] = blank
         metrics["Avg. Up Month %"] = (
             _stats.avg_win(
@@ -1196,76 +1473,39 @@ def metrics(
 
         if "benchmark" in df:
             metrics["~~~~~~~~~~~~"] = blank
-            if isinstance(returns, _pd.Series):
-                greeks = _stats.greeks(
-                    df["returns"], df["benchmark"], win_year, prepare_returns=False
-                )
-                metrics["Beta"] = [str(round(greeks["beta"], 2)), "-"]
-                metrics["Alpha"] = [str(round(greeks["alpha"], 2)), "-"]
-                metrics["Correlation"] = [
-                    str(round(df["benchmark"].corr(df["returns"]) * pct, 2)) + "%",
-                    "-",
-                ]
-                metrics["Treynor Ratio"] = [
-                    str(
-                        round(
-                            _stats.treynor_ratio(
-                                df["returns"], df["benchmark"], win_year, rf
-                            )
-                            * pct,
-                            2,
-                        )
-                    )
-                    + "%",
-                    "-",
-                ]
-            elif isinstance(returns, _pd.DataFrame):
-                greeks = [
-                    _stats.greeks(
-                        df[strategy_col],
-                        df["benchmark"],
-                        win_year,
-                        prepare_returns=False,
-                    )
-                    for strategy_col in df_strategy_columns
-                ]
-                metrics["Beta"] = [str(round(g["beta"], 2)) for g in greeks] + ["-"]
-                metrics["Alpha"] = [str(round(g["alpha"], 2)) for g in greeks] + ["-"]
-                metrics["Correlation"] = (
-                    [
-                        str(round(df["benchmark"].corr(df[strategy_col]) * pct, 2))
-                        + "%"
-                        for strategy_col in df_strategy_columns
-                    ]
-                ) + ["-"]
-                metrics["Treynor Ratio"] = (
-                    [
-                        str(
-                            round(
-                                _stats.treynor_ratio(
-                                    df[strategy_col], df["benchmark"], win_year, rf
-                                )
-                                * pct,
-                                2,
-                            )
-                        )
-                        + "%"
-                        for strategy_col in df_strategy_columns
-                    ]
-                ) + ["-"]
+            # see stats.treynor_ratio(), a zero beta gives 0
+            beta = bench_stats["beta"]
+            total = _np.asarray(_stats.comp(df[bench_columns]), dtype=_np.float64)
+            with _np.errstate(divide="ignore", invalid="ignore"):
+                treynor = _np.where(beta == 0, 0, (total - rf) / beta)
+
+            metrics["Beta"] = [str(round(x, 2)) for x in beta] + ["-"]
+            metrics["Alpha"] = [str(round(x, 2)) for x in bench_stats["alpha"]] + ["-"]
+            metrics["Correlation"] = [
+                str(round(x * pct, 2)) + "%" for x in bench_stats["corr"]
+            ] + ["-"]
+            metrics["Treynor Ratio"] = [
+                str(round(x * pct, 2)) + "%" for x in treynor
+            ] + ["-"]
 
     # prepare for display
     for col in metrics.columns:
+        suffix = "%" if as_text and "%" in col else ""
         try:
-            metrics[col] = metrics[col].astype(float).round(2)
-            if display or "internal" in kwargs:
-                metrics[col] = metrics[col].astype(str)
+            values = metrics[col].astype(float).round(2)
+            if as_text:
+                # stringified in numpy, adding the "%" in the same go
+                values = values.to_numpy().astype(str)
+                if suffix and "*int" not in col:
+                    values = _np.char.add(values, suffix)
+                    suffix = ""
+            metrics[col] = values
         except Exception:
             pass
-        if (display or "internal" in kwargs) and "*int" in col:
+        if as_text and "*int" in col:
             metrics[col] = metrics[col].str.replace(".0", "", regex=False)
             metrics.rename({col: col.replace("*int", "")}, axis=1, inplace=True)
-        if (display or "internal" in kwargs) and "%" in col:
+        if suffix:
             metrics[col] = metrics[col] + "%"
 
     try:
@@ -1276,13 +1516,13 @@ def metrics(
             metrics["Avg. Drawdown Days"]
         ).astype("int")
 
-        if display or "internal" in kwargs:
+        if as_text:
             metrics["Longest DD Days"] = metrics["Longest DD Days"].astype(str)
             metrics["Avg. Drawdown Days"] = metrics["Avg. Drawdown Days"].astype(str)
     except Exception:
         metrics["Longest DD Days"] = "-"
         metrics["Avg. Drawdown Days"] = "-"
-        if display or "internal" in kwargs:
+        if as_text:
             metrics["Longest DD Days"] = "-"
             metrics["Avg. Drawdown Days"] = "-"
 
@@ -1292,7 +1532,7 @@ def metrics(
     if "benchmark" in df:
         column_names = [strategy_colname, benchmark_colname]
         if isinstance(strategy_colname, list):
-            metrics.columns = list(_pd.core.common.flatten(column_names))
+            metrics.columns = strategy_colname + [benchmark_colname]
         else:
             metrics.columns = column_names
     else:
@@ -1303,24 +1543,15 @@ def metrics(
 
     # cleanups
     metrics.replace([-0, "-0"], 0, inplace=True)
-    metrics.replace(
-        [
-            _np.nan,
-            -_np.nan,
-            _np.inf,
-            -_np.inf,
-            "-nan%",
-            "nan%",
-            "-nan",
-            "nan",
-            "-inf%",
-            "inf%",
-            "-inf",
-            "inf",
-        ],
-        "-",
-        inplace=True,
-    )
+    # nan / inf values, formatted or not, are shown as "-"
+    for i in range(metrics.shape[1]):
+        values = metrics.iloc[:, i]
+        if values.dtype.kind in "iuf":
+            missing = ~_np.isfinite(values.to_numpy())
+        else:
+            missing = values.isna().to_numpy() | values.isin(_MISSING_VALUES).to_numpy()
+        if missing.any():
+            metrics.isetitem(i, values.mask(missing, "-"))
 
     # move benchmark to be the first column always if present
     if "benchmark" in df:
@@ -1329,20 +1560,6 @@ def metrics(
             + [col for col in metrics.columns if col != benchmark_colname]
         ]
 
-    if display:
-        print(_tabulate(metrics, headers="keys", tablefmt="simple"))
-        return None
-
-    if not sep:
-        metrics = metrics[metrics.index != ""]
-
-    # remove spaces from column names
-    metrics = metrics.T
-    metrics.columns = [
-        c.replace(" %", "").replace(" *int", "").strip() for c in metrics.columns
-    ]
-    metrics = metrics.T
-
     return metrics
 
 
@@ -1356,19 +1573,25 @@ def plots(
     periods_per_year=365,
     prepare_returns=True,
     match_dates=True,
+    parallel=False,
     **kwargs,
 ):
-    """Plots for strategy performance"""
+    """
+    Plots for strategy performance
+
+    With parallel=True (in a notebook), the plots are rendered on a
+    process pool and displayed in order once they're done
+    """
 
     benchmark_colname = kwargs.get("benchmark_title", "Benchmark")
     strategy_colname = kwargs.get("strategy_title", "Strategy")
     active = kwargs.get("active", "False")
 
-    if (
-        isinstance(returns, _pd.DataFrame)
-        and len(returns.columns) > 1
-        and isinstance(strategy_colname, str)
-    ):
+    full_mode = mode.lower() == "full"
+    is_series = isinstance(returns, _pd.Series)
+    is_frame = isinstance(returns, _pd.DataFrame)
+
+    if is_frame and len(returns.columns) > 1 and isinstance(strategy_colname, str):
         strategy_colname = list(returns.columns)
 
     win_year, win_half_year = _get_trading_periods(periods_per_year)
@@ -1379,50 +1602,67 @@ def plots(
     if prepare_returns:
         returns = _utils._prepare_returns(returns)
 
-    if isinstance(returns, _pd.Series):
+    if is_series:
         returns.name = strategy_colname
-    elif isinstance(returns, _pd.DataFrame):
+    elif is_frame:
         returns.columns = strategy_colname
 
-    if mode.lower() != "full":
-        _plots.snapshot(
-            returns,
-            grayscale=grayscale,
-            figsize=(figsize[0], figsize[0]),
-            show=True,
-            mode=("comp" if compounded else "sum"),
-            benchmark_title=benchmark_colname,
-            strategy_title=strategy_colname,
+    # (func, args, kwargs) per plot, see _show_plots()
+    jobs = []
+
+    if not full_mode:
+        jobs.append(
+            (
+                _plots.snapshot,
+                (returns,),
+                dict(
+                    grayscale=grayscale,
+                    figsize=(figsize[0], figsize[0]),
+                    mode=("comp" if compounded else "sum"),
+                    benchmark_title=benchmark_colname,
+                    strategy_title=strategy_colname,
+                ),
+            )
         )
 
-        if isinstance(returns, _pd.Series):
-            _plots.monthly_heatmap(
-                returns,
-                benchmark,
-                grayscale=grayscale,
-                figsize=(figsize[0], figsize[0] * 0.5),
-                show=True,
-                ylabel=False,
-                compounded=compounded,
-                active=active,
+        if is_series:
+            jobs.append(
+                (
+                    _plots.monthly_heatmap,
+                    (returns, benchmark),
+                    dict(
+                        grayscale=grayscale,
+                        figsize=(figsize[0], figsize[0] * 0.5),
+                        ylabel=False,
+                        compounded=compounded,
+                        active=active,
+                    ),
+                )
             )
-        elif isinstance(returns, _pd.DataFrame):
+        elif is_frame:
             for col in returns.columns:
-                _plots.monthly_heatmap(
-                    returns[col].dropna(),
-                    benchmark,
-                    grayscale=grayscale,
-                    figsize=(figsize[0], figsize[0] * 0.5),
-                    show=True,
-                    ylabel=False,
-                    returns_label=col,
-                    compounded=compounded,
-                    active=active,
+                jobs.append(
+                    (
+                        _plots.monthly_heatmap,
+                        (returns[col].dropna(), benchmark),
+                        dict(
+                            grayscale=grayscale,
+                            figsize=(figsize[0], figsize[0] * 0.5),
+                            ylabel=False,
+                            returns_label=col,
+                            compounded=compounded,
+                            active=active,
+                        ),
+                    )
                 )
 
+        _show_plots(jobs, parallel)
         return
 
     returns = _pd.DataFrame(returns)
+    # returns is a frame from here on, plotted per column
+    is_series = isinstance(returns, _pd.Series)
+    is_frame = isinstance(returns, _pd.DataFrame)
 
     # prepare timeseries
     if benchmark is not None:
@@ -1431,56 +1671,71 @@ def plots(
         if match_dates is True:
             returns, benchmark = _match_dates(returns, benchmark)
 
-    _plots.returns(
-        returns,
-        benchmark,
-        grayscale=grayscale,
-        figsize=(figsize[0], figsize[0] * 0.6),
-        show=True,
-        ylabel=False,
-        prepare_returns=False,
+    jobs.append(
+        (
+            _plots.returns,
+            (returns, benchmark),
+            dict(
+                grayscale=grayscale,
+                figsize=(figsize[0], figsize[0] * 0.6),
+                ylabel=False,
+                prepare_returns=False,
+            ),
+        )
     )
 
-    _plots.log_returns(
-        returns,
-        benchmark,
-        grayscale=grayscale,
-        figsize=(figsize[0], figsize[0] * 0.5),
-        show=True,
-        ylabel=False,
-        prepare_returns=False,
+    jobs.append(
+        (
+            _plots.log_returns,
+            (returns, benchmark),
+            dict(
+                grayscale=grayscale,
+                figsize=(figsize[0], figsize[0] * 0.5),
+                ylabel=False,
+                prepare_returns=False,
+            ),
+        )
     )
 
     if benchmark is not None:
-        _plots.returns(
-            returns,
-            benchmark,
-            match_volatility=True,
-            grayscale=grayscale,
-            figsize=(figsize[0], figsize[0] * 0.5),
-            show=True,
-            ylabel=False,
-            prepare_returns=False,
+        jobs.append(
+            (
+                _plots.returns,
+                (returns, benchmark),
+                dict(
+                    match_volatility=True,
+                    grayscale=grayscale,
+                    figsize=(figsize[0], figsize[0] * 0.5),
+                    ylabel=False,
+                    prepare_returns=False,
+                ),
+            )
         )
 
-    _plots.yearly_returns(
-        returns,
-        benchmark,
-        grayscale=grayscale,
-        figsize=(figsize[0], figsize[0] * 0.5),
-        show=True,
-        ylabel=False,
-        prepare_returns=False,
+    jobs.append(
+        (
+            _plots.yearly_returns,
+            (returns, benchmark),
+            dict(
+                grayscale=grayscale,
+                figsize=(figsize[0], figsize[0] * 0.5),
+                ylabel=False,
+                prepare_returns=False,
+            ),
+        )
     )
 
-    _plots.histogram(
-        returns,
-        benchmark,
-        grayscale=grayscale,
-        figsize=(figsize[0], figsize[0] * 0.5),
-        show=True,
-        ylabel=False,
-        prepare_returns=False,
+    jobs.append(
+        (
+            _plots.histogram,
+            (returns, benchmark),
+            dict(
+                grayscale=grayscale,
+                figsize=(figsize[0], figsize[0] * 0.5),
+                ylabel=False,
+                prepare_returns=False,
+            ),
+        )
     )
 
     small_fig_size = (figsize[0], figsize[0] * 0.35)
@@ -1490,209 +1745,231 @@ def plots(
             figsize[0] * (0.33 * (len(returns.columns) * 0.66)),
         )
 
-    _plots.daily_returns(
-        returns,
-        benchmark,
-        grayscale=grayscale,
-        figsize=small_fig_size,
-        show=True,
-        ylabel=False,
-        prepare_returns=False,
-        active=active,
+    jobs.append(
+        (
+            _plots.daily_returns,
+            (returns, benchmark),
+            dict(
+                grayscale=grayscale,
+                figsize=small_fig_size,
+                ylabel=False,
+                prepare_returns=False,
+                active=active,
+            ),
+        )
     )
 
     if benchmark is not None:
-        _plots.rolling_beta(
-            returns,
-            benchmark,
-            grayscale=grayscale,
-            window1=win_half_year,
-            window2=win_year,
-            figsize=small_fig_size,
-            show=True,
-            ylabel=False,
-            prepare_returns=False,
+        jobs.append(
+            (
+                _plots.rolling_beta,
+                (returns, benchmark),
+                dict(
+                    grayscale=grayscale,
+                    window1=win_half_year,
+                    window2=win_year,
+                    figsize=small_fig_size,
+                    ylabel=False,
+                    prepare_returns=False,
+                ),
+            )
         )
 
-    _plots.rolling_volatility(
-        returns,
-        benchmark,
-        grayscale=grayscale,
-        figsize=small_fig_size,
-        show=True,
-        ylabel=False,
-        period=win_half_year,
+    jobs.append(
+        (
+            _plots.rolling_volatility,
+            (returns, benchmark),
+            dict(
+                grayscale=grayscale,
+                figsize=small_fig_size,
+                ylabel=False,
+                period=win_half_year,
+            ),
+        )
     )
 
-    _plots.rolling_sharpe(
-        returns,
-        grayscale=grayscale,
-        figsize=small_fig_size,
-        show=True,
-        ylabel=False,
-        period=win_half_year,
+    jobs.append(
+        (
+            _plots.rolling_sharpe,
+            (returns,),
+            dict(
+                grayscale=grayscale,
+                figsize=small_fig_size,
+                ylabel=False,
+                period=win_half_year,
+            ),
+        )
     )
 
-    _plots.rolling_sortino(
-        returns,
-        grayscale=grayscale,
-        figsize=small_fig_size,
-        show=True,
-        ylabel=False,
-        period=win_half_year,
+    jobs.append(
+        (
+            _plots.rolling_sortino,
+            (returns,),
+            dict(
+                grayscale=grayscale,
+                figsize=small_fig_size,
+                ylabel=False,
+                period=win_half_year,
+            ),
+        )
     )
 
-    if isinstance(returns, _pd.Series):
-        _plots.drawdowns_periods(
-            returns,
-            grayscale=grayscale,
-            figsize=(figsize[0], figsize[0] * 0.5),
-            show=True,
-            ylabel=False,
-            prepare_returns=False,
+    if is_series:
+        jobs.append(
+            (
+                _plots.drawdowns_periods,
+                (returns,),
+                dict(
+                    grayscale=grayscale,
+                    figsize=(figsize[0], figsize[0] * 0.5),
+                    ylabel=False,
+                    prepare_returns=False,
+                ),
+            )
         )
-    elif isinstance(returns, _pd.DataFrame):
+    elif is_frame:
         for col in returns.columns:
-            _plots.drawdowns_periods(
-                returns[col],
-                grayscale=grayscale,
-                figsize=(figsize[0], figsize[0] * 0.5),
-                show=True,
-                ylabel=False,
-                title=col,
-                prepare_returns=False,
+            jobs.append(
+                (
+                    _plots.drawdowns_periods,
+                    (returns[col],),
+                    dict(
+                        grayscale=grayscale,
+                        figsize=(figsize[0], figsize[0] * 0.5),
+                        ylabel=False,
+                        title=col,
+                        prepare_returns=False,
+                    ),
+                )
             )
 
-    _plots.drawdown(
-        returns,
-        grayscale=grayscale,
-        figsize=(figsize[0], figsize[0] * 0.4),
-        show=True,
-        ylabel=False,
+    jobs.append(
+        (
+            _plots.drawdown,
+            (returns,),
+            dict(
+                grayscale=grayscale,
+                figsize=(figsize[0], figsize[0] * 0.4),
+                ylabel=False,
+            ),
+        )
     )
 
-    if isinstance(returns, _pd.Series):
-        _plots.monthly_heatmap(
-            returns,
-            benchmark,
-            grayscale=grayscale,
-            figsize=(figsize[0], figsize[0] * 0.5),
-            returns_label=returns.name,
-            show=True,
-            ylabel=False,
-            active=active,
+    if is_series:
+        jobs.append(
+            (
+                _plots.monthly_heatmap,
+                (returns, benchmark),
+                dict(
+                    grayscale=grayscale,
+                    figsize=(figsize[0], figsize[0] * 0.5),
+                    returns_label=returns.name,
+                    ylabel=False,
+                    active=active,
+                ),
+            )
         )
-    elif isinstance(returns, _pd.DataFrame):
+    elif is_frame:
         for col in returns.columns:
-            _plots.monthly_heatmap(
-                returns[col],
-                benchmark,
-                grayscale=grayscale,
-                figsize=(figsize[0], figsize[0] * 0.5),
-                show=True,
-                ylabel=False,
-                returns_label=col,
-                compounded=compounded,
-                active=active,
+            jobs.append(
+                (
+                    _plots.monthly_heatmap,
+                    (returns[col], benchmark),
+                    dict(
+                        grayscale=grayscale,
+                        figsize=(figsize[0], figsize[0] * 0.5),
+                        ylabel=False,
+                        returns_label=col,
+                        compounded=compounded,
+                        active=active,
+                    ),
+                )
             )
 
-    if isinstance(returns, _pd.Series):
-        _plots.distribution(
-            returns,
-            grayscale=grayscale,
-            figsize=(figsize[0], figsize[0] * 0.5),
-            show=True,
-            title=returns.name,
-            ylabel=False,
-            prepare_returns=False,
+    if is_series:
+        jobs.append(
+            (
+                _plots.distribution,
+                (returns,),
+                dict(
+                    grayscale=grayscale,
+                    figsize=(figsize[0], figsize[0] * 0.5),
+                    title=returns.name,
+                    ylabel=False,
+                    prepare_returns=False,
+                ),
+            )
         )
-    elif isinstance(returns, _pd.DataFrame):
+    elif is_frame:
         for col in returns.columns:
-            _plots.distribution(
-                returns[col],
-                grayscale=grayscale,
-                figsize=(figsize[0], figsize[0] * 0.5),
-                show=True,
-                title=col,
-                ylabel=False,
-                prepare_returns=False,
+            jobs.append(
+                (
+                    _plots.distribution,
+                    (returns[col],),
+                    dict(
+                        grayscale=grayscale,
+                        figsize=(figsize[0], figsize[0] * 0.5),
+                        title=col,
+                        ylabel=False,
+                        prepare_returns=False,
+                    ),
+                )
             )
 
+    _show_plots(jobs, parallel)
+
+
+def _show_plots(jobs, parallel=False):
+    """
+    Shows (func, args, kwargs) plot jobs in order, rendering them
+    on a process pool first when parallel (notebooks only, as the
+    figures are displayed as images)
+    """
+    if parallel and _utils._in_notebook():
+        for figbytes in _render_figures(jobs, "png", parallel=True):
+            iDisplay(iImage(data=figbytes, format="png"))
+        return
+
+    for func, args, kwargs in jobs:
+        func(*args, show=True, **kwargs)
+
+
+def _dd_summary(dd_info):
+    """Summarizes a single column's drawdown details"""
+    max_dd = dd_info["max drawdown"]
+    days = dd_info["days"]
+    return {
+        "Max Drawdown %": max_dd.min() / 100,
+        "Longest DD Days": str(_np.round(days.max())),
+        "Avg. Drawdown %": max_dd.mean() / 100,
+        "Avg. Drawdown Days": str(_np.round(days.mean())),
+    }
 
-def _calc_dd(df, display=True, as_pct=False):
+
+def _calc_dd(df, display=True, as_pct=False, dd=None):
     """Returns drawdown stats"""
-    dd = _stats.to_drawdown_series(df)
+    if dd is None:
+        dd = _stats.to_drawdown_series(df)
     dd_info = _stats.drawdown_details(dd)
 
     if dd_info.empty:
         return _pd.DataFrame()
 
-    if "returns" in dd_info:
-        ret_dd = dd_info["returns"]
-    # to match multiple columns like returns_1, returns_2, ...
-    elif (
-        any(dd_info.columns.get_level_values(0).str.contains("returns"))
-        and dd_info.columns.get_level_values(0).nunique() > 1
-    ):
-        ret_dd = dd_info.loc[
-            :, dd_info.columns.get_level_values(0).str.contains("returns")
+    # strategies are named returns or returns_1, returns_2, ...
+    columns = dd_info.columns
+    if isinstance(columns, _pd.MultiIndex):
+        strategies = [
+            col for col in columns.get_level_values(0).unique() if "returns" in str(col)
         ]
     else:
-        ret_dd = dd_info
+        strategies = []
 
-    if (
-        any(ret_dd.columns.get_level_values(0).str.contains("returns"))
-        and ret_dd.columns.get_level_values(0).nunique() > 1
-    ):
-        dd_stats = {
-            col: {
-                "Max Drawdown %": ret_dd[col]
-                .sort_values(by="max drawdown", ascending=True)["max drawdown"]
-                .values[0]
-                / 100,
-                "Longest DD Days": str(
-                    _np.round(
-                        ret_dd[col]
-                        .sort_values(by="days", ascending=False)["days"]
-                        .values[0]
-                    )
-                ),
-                "Avg. Drawdown %": ret_dd[col]["max drawdown"].mean() / 100,
-                "Avg. Drawdown Days": str(_np.round(ret_dd[col]["days"].mean())),
-            }
-            for col in ret_dd.columns.get_level_values(0)
-        }
+    if strategies:
+        dd_stats = {col: _dd_summary(dd_info[col]) for col in strategies}
     else:
-        dd_stats = {
-            "returns": {
-                "Max Drawdown %": ret_dd.sort_values(by="max drawdown", ascending=True)[
-                    "max drawdown"
-                ].values[0]
-                / 100,
-                "Longest DD Days": str(
-                    _np.round(
-                        ret_dd.sort_values(by="days", ascending=False)["days"].values[0]
-                    )
-                ),
-                "Avg. Drawdown %": ret_dd["max drawdown"].mean() / 100,
-                "Avg. Drawdown Days": str(_np.round(ret_dd["days"].mean())),
-            }
-        }
-    if "benchmark" in df and (dd_info.columns, _pd.MultiIndex):
-        bench_dd = dd_info["benchmark"].sort_values(by="max drawdown")
-        dd_stats["benchmark"] = {
-            "Max Drawdown %": bench_dd.sort_values(by="max drawdown", ascending=True)[
-                "max drawdown"
-            ].values[0]
-            / 100,
-            "Longest DD Days": str(
-                _np.round(
-                    bench_dd.sort_values(by="days", ascending=False)["days"].values[0]
-                )
-            ),
-            "Avg. Drawdown %": bench_dd["max drawdown"].mean() / 100,
-            "Avg. Drawdown Days": str(_np.round(bench_dd["days"].mean())),
-        }
+        dd_stats = {"returns": _dd_summary(dd_info)}
+    if "benchmark" in df and isinstance(columns, _pd.MultiIndex):
+        dd_stats["benchmark"] = _dd_summary(dd_info["benchmark"])
 
     # pct multiplier
     pct = 100 if display or as_pct else 1
@@ -1712,19 +1989,12 @@ def _html_table(obj, showindex="default"):
     obj = obj.replace(' style="text-align: right;"', "")
     obj = obj.replace(' style="text-align: left;"', "")
     obj = obj.replace(' style="text-align: center;"', "")
-    obj = _regex.sub("<td> +", "<td>", obj)
-    obj = _regex.sub(" +</td>", "</td>", obj)
-    obj = _regex.sub("<th> +", "<th>", obj)
-    obj = _regex.sub(" +</th>", "</th>", obj)
-    return obj
+    return _CELL_PADDING_RE.sub("", obj)
 
 
-def _download_html(html, filename="quantstats-tearsheet.html"):
-    """Downloads HTML report"""
-    jscode = _regex.sub(
-        " +",
-        " ",
-        """<script>
+_DOWNLOAD_JS = _SPACES_RE.sub(
+    " ",
+    """<script>
     var bl=new Blob(['{{html}}'],{type:"text/html"});
     var a=document.createElement("a");
     a.href=URL.createObjectURL(bl);
@@ -1732,42 +2002,168 @@ def _download_html(html, filename="quantstats-tearsheet.html"):
     a.hidden=true;document.body.appendChild(a);
     a.innerHTML="download report";
     a.click();</script>""".replace("\n", ""),
+)
+
+_OPEN_JS = _SPACES_RE.sub(
+    " ",
+    """<script>
+    var win=window.open();win.document.body.innerHTML='{{html}}';
+    </script>""".replace("\n", ""),
+)
+
+
+def _download_html(html, filename="quantstats-tearsheet.html"):
+    """Downloads HTML report"""
+    jscode = _DOWNLOAD_JS.replace(
+        "{{html}}", _SPACES_RE.sub(" ", html.replace("\n", ""))
     )
-    jscode = jscode.replace("{{html}}", _regex.sub(" +", " ", html.replace("\n", "")))
     if _utils._in_notebook():
         iDisplay(iHTML(jscode.replace("{{filename}}", filename)))
 
 
 def _open_html(html):
     """Opens HTML in a new tab"""
-    jscode = _regex.sub(
-        " +",
-        " ",
-        """<script>
-    var win=window.open();win.document.body.innerHTML='{{html}}';
-    </script>""".replace("\n", ""),
-    )
-    jscode = jscode.replace("{{html}}", _regex.sub(" +", " ", html.replace("\n", "")))
+    jscode = _OPEN_JS.replace("{{html}}", _SPACES_RE.sub(" ", html.replace("\n", "")))
     if _utils._in_notebook():
         iDisplay(iHTML(jscode))
 
 
-def _embed_figure(figfiles, figfmt):
-    """Embeds the figure bytes in the html output"""
-    if isinstance(figfiles, list):
-        embed_string = "\n"
-        for figfile in figfiles:
-            figbytes = figfile.getvalue()
-            if figfmt == "svg":
-                return figbytes.decode()
-            data_uri = _b64encode(figbytes).decode()
-            embed_string.join(
-                '<img src="data:image/{};base64,{}" />'.format(figfmt, data_uri)
-            )
+# rendered figure bytes of recent plots, see _render_figures(),
+# only used by html(cache_plots=True)
+_PLOT_CACHE = _OrderedDict()
+_PLOT_CACHE_SIZE = 32
+
+
+def _init_plot_worker():
+    """Plot worker processes render off screen"""
+    import matplotlib
+
+    matplotlib.use("Agg")
+
+
+# fastest encoder settings for raster figures, the size
+# difference doesn't matter for a base64 embedded report
+_PIL_SAVE_OPTIONS = {
+    "png": {"compress_level": 1},
+    "webp": {"method": 0},
+}
+
+
+def _draw_plot(func, args, kwargs, figfmt, figfile):
+    """Renders a single plot into the figfile stream"""
+    savefig = {"fname": figfile, "format": figfmt}
+    if figfmt in _PIL_SAVE_OPTIONS:
+        savefig["pil_kwargs"] = dict(_PIL_SAVE_OPTIONS[figfmt])
+    func(*args, savefig=savefig, show=False, **kwargs)
+
+
+def _render_plot(func, args, kwargs, figfmt):
+    """Renders a single plot and returns the figure bytes"""
+    figfile = _utils._file_stream()
+    _draw_plot(func, args, kwargs, figfmt, figfile)
+    return figfile.getvalue()
+
+
+def _style_digest():
+    """Hash of the current matplotlib rcParams (style) state"""
+    return _blake2b(repr(dict(_matplotlib.rcParams)).encode(), digest_size=16).digest()
+
+
+def _plot_cache_key(func, args, kwargs, figfmt, style):
+    """Identifies a plot job by its function, data, options and style"""
+
+    def _token(value):
+        if isinstance(value, (_pd.Series, _pd.DataFrame)):
+            return _data_digest(value)
+        return repr(value)
+
+    return (
+        func.__module__ + "." + func.__qualname__,
+        figfmt,
+        style,
+        tuple(_token(arg) for arg in args),
+        tuple((name, _token(kwargs[name])) for name in sorted(kwargs)),
+    )
+
+
+def _render_figures(jobs, figfmt, parallel=False, cache=False, encode=bytes):
+    """
+    Renders (func, args, kwargs) plot jobs, optionally on a process
+    pool, and returns encode(figure bytes) per job, the bytes by default
+    """
+    rendered = [None] * len(jobs)
+    if cache:
+        # figures rendered for the same inputs by earlier reports are reused
+        style = _style_digest()
+        keys = [
+            _plot_cache_key(func, args, kwargs, figfmt, style)
+            for func, args, kwargs in jobs
+        ]
+        for i, key in enumerate(keys):
+            if key in _PLOT_CACHE:
+                _PLOT_CACHE.move_to_end(key)
+                rendered[i] = encode(_PLOT_CACHE[key])
+    pending = [i for i, figure in enumerate(rendered) if figure is None]
+
+    raw = {}
+    workers = min(_os.cpu_count() or 1, len(pending))
+    if parallel and workers > 1:
+        with _ProcessPoolExecutor(
+            max_workers=workers, initializer=_init_plot_worker
+        ) as pool:
+            futures = {i: pool.submit(_render_plot, *jobs[i], figfmt) for i in pending}
+            for i, future in futures.items():
+                raw[i] = future.result()
     else:
-        figbytes = figfiles.getvalue()
-        if figfmt == "svg":
-            return figbytes.decode()
-        data_uri = _b64encode(figbytes).decode()
-        embed_string = '<img src="data:image/{};base64,{}" />'.format(figfmt, data_uri)
-    return embed_string
+        # one stream, reset and reused for every figure, and when the
+        # bytes aren't cached each figure is encoded straight from it
+        figfile = _utils._file_stream()
+        for i in pending:
+            func, args, kwargs = jobs[i]
+            _draw_plot(func, args, kwargs, figfmt, _utils._reset_stream(figfile))
+            if cache:
+                raw[i] = figfile.getvalue()
+            else:
+                with figfile.getbuffer() as figbytes:
+                    rendered[i] = encode(figbytes)
+
+    for i, figbytes in raw.items():
+        rendered[i] = encode(figbytes)
+        if cache:
+            _PLOT_CACHE[keys[i]] = figbytes
+    if cache:
+        while len(_PLOT_CACHE) > _PLOT_CACHE_SIZE:
+            _PLOT_CACHE.popitem(last=False)
+    return rendered
+
+
+def _render_plots(jobs, figfmt, parallel=False, cache=False):
+    """
+    Renders (placeholder, func, args, kwargs) plot jobs, optionally
+    on a process pool, and returns the html embed per placeholder
+    """
+    embeds = _render_figures(
+        [job[1:] for job in jobs],
+        figfmt,
+        parallel,
+        cache,
+        encode=lambda figbytes: _embed_figure(figbytes, figfmt),
+    )
+
+    # plots sharing a placeholder (one per strategy) are embedded
+    # together, inline svgs concatenated and images one per line
+    grouped = {}
+    for (placeholder, *_), embed in zip(jobs, embeds):
+        grouped.setdefault(placeholder, []).append(embed)
+    separator = "" if figfmt == "svg" else "\n"
+    return {
+        placeholder: separator.join(chunks) for placeholder, chunks in grouped.items()
+    }
+
+
+def _embed_figure(figbytes, figfmt):
+    """Embeds a figure's bytes (or a buffer of them) in the html output"""
+    if figfmt == "svg":
+        return str(figbytes, "utf-8")
+    data_uri = _b64encode(figbytes).decode()
+    return '<img src="data:image/{};base64,{}" />'.format(figfmt, data_uri)
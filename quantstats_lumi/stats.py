@@ -18,15 +18,18 @@
 # See the License for the specific language governing permissions and
 # limitations under the License.
 
+from functools import lru_cache as _lru_cache
 from math import ceil as _ceil
 from math import sqrt as _sqrt
 from warnings import warn
 
 import numpy as _np
 import pandas as _pd
+from scipy.special import ndtr as _ndtr
+from scipy.special import ndtri as _ndtri
 from scipy.stats import linregress as _linregress
-from scipy.stats import norm as _norm
 
+from . import _numba_kernels as _kernels
 from . import utils as _utils
 
 # ======== STATS ========
@@ -45,6 +48,15 @@ def compsum(returns):
 
 def comp(returns):
     """Calculates total compounded returns"""
+    if isinstance(returns, _pd.DataFrame):
+        values = returns.to_numpy(dtype=_np.float64)
+        return _pd.Series(
+            [_kernels._comp(values[:, i]) for i in range(values.shape[1])],
+            index=returns.columns,
+            dtype=_np.float64,
+        )
+    if isinstance(returns, _pd.Series):
+        return _np.float64(_kernels._comp(returns.to_numpy(dtype=_np.float64)))
     return returns.add(1).prod() - 1
 
 
@@ -102,7 +114,11 @@ def expected_return(returns, aggregate=None, compounded=True, prepare_returns=Tr
     if prepare_returns:
         returns = _utils._prepare_returns(returns)
     returns = _utils.aggregate_returns(returns, aggregate, compounded)
-    return _np.prod(1 + returns, axis=0) ** (1 / len(returns)) - 1
+    # log space: prod(1 + returns) under/overflows on long series
+    growth = _np.log1p(_np.asarray(returns, dtype=_np.float64)).mean(axis=0)
+    if isinstance(returns, _pd.DataFrame):
+        return _pd.Series(_np.expm1(growth), index=returns.columns)
+    return _np.expm1(growth)
 
 
 def geometric_mean(retruns, aggregate=None, compounded=True):
@@ -115,14 +131,28 @@ def ghpr(retruns, aggregate=None, compounded=True):
     return expected_return(retruns, aggregate, compounded)
 
 
+def _quantiles(values, quantiles):
+    """
+    Linear-interpolated quantiles (per column) of an ndarray,
+    skipping nans like Series.quantile(). Several quantiles
+    are selected in a single partition pass.
+    """
+    return _np.nanquantile(values, quantiles, axis=0)
+
+
 def outliers(returns, quantile=0.95):
     """Returns series of outliers"""
-    return returns[returns > returns.quantile(quantile)].dropna(how="all")
+    values = _np.asarray(returns, dtype=_np.float64)
+    return returns.where(values > _quantiles(values, quantile)).dropna(how="all")
 
 
 def remove_outliers(returns, quantile=0.95):
     """Returns series of returns without the outliers"""
-    return returns[returns < returns.quantile(quantile)]
+    values = _np.asarray(returns, dtype=_np.float64)
+    mask = values < _quantiles(values, quantile)
+    if isinstance(returns, _pd.DataFrame):
+        return returns.where(mask)
+    return returns[mask]
 
 
 def best(returns, aggregate=None, compounded=True, prepare_returns=True):
@@ -139,12 +169,22 @@ def worst(returns, aggregate=None, compounded=True, prepare_returns=True):
     return _utils.aggregate_returns(returns, aggregate, compounded).min()
 
 
+def _max_streak(flags):
+    """Longest run of True values (per column for DataFrames)"""
+    if isinstance(flags, _pd.DataFrame):
+        _df = {}
+        for col in flags.columns:
+            _df[col] = _kernels._max_true_run(flags[col].to_numpy(dtype=bool))
+        return _pd.Series(_df)
+    return _kernels._max_true_run(flags.to_numpy(dtype=bool))
+
+
 def consecutive_wins(returns, aggregate=None, compounded=True, prepare_returns=True):
     """Returns the maximum consecutive wins by day/month/week/quarter/year"""
     if prepare_returns:
         returns = _utils._prepare_returns(returns)
     returns = _utils.aggregate_returns(returns, aggregate, compounded) > 0
-    return _utils._count_consecutive(returns).max()
+    return _max_streak(returns)
 
 
 def consecutive_losses(returns, aggregate=None, compounded=True, prepare_returns=True):
@@ -155,7 +195,7 @@ def consecutive_losses(returns, aggregate=None, compounded=True, prepare_returns
     if prepare_returns:
         returns = _utils._prepare_returns(returns)
     returns = _utils.aggregate_returns(returns, aggregate, compounded) < 0
-    return _utils._count_consecutive(returns).max()
+    return _max_streak(returns)
 
 
 def exposure(returns, prepare_returns=True):
@@ -176,28 +216,32 @@ def exposure(returns, prepare_returns=True):
     return _exposure(returns)
 
 
-def win_rate(returns, aggregate=None, compounded=True, prepare_returns=True):
-    """Calculates the win ratio for a period"""
+def _win_rate(masks):
+    """Win ratio from _utils._return_masks(), 0 when there are no trades"""
+    with _np.errstate(divide="ignore", invalid="ignore"):
+        rate = masks.pos_count / masks.nonzero_count
+    return _np.where(masks.nonzero_count > 0, rate, 0.0)
+
+
+def _masked_mean(returns, mask, total, count):
+    """Mean of the masked returns (see avg_win/avg_loss)"""
+    if isinstance(returns, _pd.DataFrame):
+        # same as returns[mask].dropna(): rows must match on every column
+        return returns[mask.all(axis=1)].mean()
+    return total / count if count else _np.nan
 
-    def _win_rate(series):
-        try:
-            return len(series[series > 0]) / len(series[series != 0])
-        except Exception:
-            return 0.0
 
+def win_rate(returns, aggregate=None, compounded=True, prepare_returns=True):
+    """Calculates the win ratio for a period"""
     if prepare_returns:
         returns = _utils._prepare_returns(returns)
     if aggregate:
         returns = _utils.aggregate_returns(returns, aggregate, compounded)
 
+    rate = _win_rate(_utils._return_masks(returns))
     if isinstance(returns, _pd.DataFrame):
-        _df = {}
-        for col in returns.columns:
-            _df[col] = _win_rate(returns[col])
-
-        return _pd.Series(_df)
-
-    return _win_rate(returns)
+        return _pd.Series(rate, index=returns.columns)
+    return float(rate)
 
 
 def avg_return(returns, aggregate=None, compounded=True, prepare_returns=True):
@@ -218,7 +262,8 @@ def avg_win(returns, aggregate=None, compounded=True, prepare_returns=True):
         returns = _utils._prepare_returns(returns)
     if aggregate:
         returns = _utils.aggregate_returns(returns, aggregate, compounded)
-    return returns[returns > 0].dropna().mean()
+    masks = _utils._return_masks(returns)
+    return _masked_mean(returns, masks.pos, masks.pos_sum, masks.pos_count)
 
 
 def avg_loss(returns, aggregate=None, compounded=True, prepare_returns=True):
@@ -230,14 +275,33 @@ def avg_loss(returns, aggregate=None, compounded=True, prepare_returns=True):
         returns = _utils._prepare_returns(returns)
     if aggregate:
         returns = _utils.aggregate_returns(returns, aggregate, compounded)
-    return returns[returns < 0].dropna().mean()
+    masks = _utils._return_masks(returns)
+    return _masked_mean(returns, masks.neg, masks.neg_sum, masks.neg_count)
+
+
+def _moments(returns):
+    """
+    Returns (mean, std, downside deviation, count) of returns
+    from a single pass, as Series per column for DataFrames
+    """
+    if isinstance(returns, _pd.DataFrame):
+        moments = [
+            _kernels._moments(returns[col].to_numpy(dtype=_np.float64))
+            for col in returns.columns
+        ]
+        return tuple(_pd.Series(m, index=returns.columns) for m in zip(*moments))
+    mean, std, downside, count = _kernels._moments(
+        returns.to_numpy(dtype=_np.float64)
+    )
+    # numpy scalars, so 0 std gives inf/nan instead of raising
+    return _np.float64(mean), _np.float64(std), _np.float64(downside), count
 
 
 def volatility(returns, periods=365, annualize=True, prepare_returns=True):
     """Calculates the volatility of returns for a period"""
     if prepare_returns:
         returns = _utils._prepare_returns(returns)
-    std = returns.std()
+    std = _moments(returns)[1]
     if annualize:
         return std * _np.sqrt(periods)
 
@@ -302,11 +366,11 @@ def sharpe(returns, rf=0.0, periods=365, annualize=True, smart=False):
         raise Exception("Must provide periods if rf != 0")
 
     returns = _utils._prepare_returns(returns, rf, periods)
-    divisor = returns.std(ddof=1)
+    mean, divisor, _, _ = _moments(returns)
     if smart:
         # penalize sharpe with auto correlation
         divisor = divisor * autocorr_penalty(returns)
-    res = returns.mean() / divisor
+    res = mean / divisor
 
     if annualize:
         return res * _np.sqrt(1 if periods is None else periods)
@@ -368,14 +432,13 @@ def sortino(returns, rf=0, periods=365, annualize=True, smart=False):
         raise Exception("Must provide periods if rf != 0")
 
     returns = _utils._prepare_returns(returns, rf, periods)
-
-    downside = _np.sqrt((returns[returns < 0] ** 2).sum() / len(returns))
+    mean, _, downside, _ = _moments(returns)
 
     if smart:
         # penalize sortino with auto correlation
         downside = downside * autocorr_penalty(returns)
 
-    res = returns.mean() / downside
+    res = mean / downside
 
     if annualize:
         return res * _np.sqrt(1 if periods is None else periods)
@@ -411,12 +474,28 @@ def rolling_sortino(
     if kwargs.get("prepare_returns", True):
         returns = _utils._prepare_returns(returns, rf, rolling_period)
 
-    downside = (
-        returns.rolling(rolling_period).apply(
-            lambda x: (x.values[x.values < 0] ** 2).sum()
+    # running sum of squared losses instead of a python call per window
+    values = _np.asarray(returns, dtype=_np.float64)
+    if isinstance(returns, _pd.DataFrame):
+        downside = _pd.DataFrame(
+            _np.column_stack(
+                [
+                    _kernels._rolling_downside(
+                        _np.ascontiguousarray(column), rolling_period
+                    )
+                    for column in values.T
+                ]
+            ),
+            index=returns.index,
+            columns=returns.columns,
         )
-        / rolling_period
-    )
+    else:
+        downside = _pd.Series(
+            _kernels._rolling_downside(values, rolling_period),
+            index=returns.index,
+            name=returns.name,
+        )
+    downside = downside / rolling_period
 
     res = returns.rolling(rolling_period).mean() / _np.sqrt(downside)
     if annualize:
@@ -467,7 +546,8 @@ def probabilistic_ratio(
     )
 
     ratio = (base - rf) / sigma_sr
-    psr = _norm.cdf(ratio)
+    # standard normal cdf, skipping scipy.stats' rv_continuous dispatch
+    psr = _ndtr(_np.asarray(ratio, dtype=_np.float64))
 
     if annualize:
         return psr * (365**0.5)
@@ -562,9 +642,12 @@ def omega(returns, rf=0.0, required_return=0.0, periods=365):
     else:
         return_threshold = (1 + required_return) ** (1.0 / periods) - 1
 
-    returns_less_thresh = returns - return_threshold
-    numer = returns_less_thresh[returns_less_thresh > 0.0].sum().values[0]
-    denom = -1.0 * returns_less_thresh[returns_less_thresh < 0.0].sum().values[0]
+    # DataFrames are scored on their first column
+    if isinstance(returns, _pd.DataFrame):
+        returns = returns[returns.columns[0]]
+    numer, denom = _kernels._omega_sums(
+        returns.to_numpy(dtype=_np.float64), float(return_threshold)
+    )
 
     if denom > 0.0:
         return numer / denom
@@ -639,19 +722,37 @@ def kurtosis(returns, prepare_returns=True):
     return returns.kurtosis()
 
 
-def calmar(returns, prepare_returns=True, periods=365):
-    """Calculates the calmar ratio (CAGR% / MaxDD%)"""
+def calmar(returns, prepare_returns=True, periods=365, dd=None):
+    """
+    Calculates the calmar ratio (CAGR% / MaxDD%)
+    (dd: the returns' to_drawdown_series(), if already computed)
+    """
     if prepare_returns:
         returns = _utils._prepare_returns(returns)
     cagr_ratio = cagr(returns=returns, periods=periods)
-    max_dd = max_drawdown(returns)
+    max_dd = max_drawdown(returns) if dd is None else dd.min()
     return cagr_ratio / abs(max_dd)
 
 
-def ulcer_index(returns):
-    """Calculates the ulcer index score (downside risk measurment)"""
-    dd = to_drawdown_series(returns)
-    return _np.sqrt(_np.divide((dd**2).sum(), returns.shape[0] - 1))
+def ulcer_index(returns, dd=None):
+    """
+    Calculates the ulcer index score (downside risk measurment)
+    (dd: the returns' to_drawdown_series(), if already computed)
+    """
+    if dd is None:
+        dd = to_drawdown_series(returns)
+    values = dd.to_numpy(dtype=_np.float64)
+    if _np.isnan(values).any():
+        # nans are skipped by the sum of squares
+        values = _np.nan_to_num(values)
+    # sum of squares without allocating dd ** 2
+    if values.ndim == 1:
+        squares = _np.einsum("i,i->", values, values)
+    else:
+        squares = _pd.Series(
+            _np.einsum("ij,ij->j", values, values), index=dd.columns
+        )
+    return _np.sqrt(_np.divide(squares, returns.shape[0] - 1))
 
 
 def ulcer_performance_index(returns, rf=0):
@@ -667,14 +768,16 @@ def upi(returns, rf=0):
     return ulcer_performance_index(returns, rf)
 
 
-def serenity_index(returns, rf=0):
+def serenity_index(returns, rf=0, dd=None):
     """
     Calculates the serenity index score
     (https://www.keyquant.com/Download/GetFile?Filename=%5CPublications%5CKeyQuant_WhitePaper_APT_Part1.pdf)
+    (dd: the returns' to_drawdown_series(), if already computed)
     """
-    dd = to_drawdown_series(returns)
+    if dd is None:
+        dd = to_drawdown_series(returns)
     pitfall = -cvar(dd) / returns.std()
-    return (returns.sum() - rf) / (ulcer_index(returns) * pitfall)
+    return (returns.sum() - rf) / (ulcer_index(returns, dd=dd) * pitfall)
 
 
 def risk_of_ruin(returns, prepare_returns=True):
@@ -693,6 +796,12 @@ def ror(returns):
     return risk_of_ruin(returns)
 
 
+@_lru_cache(maxsize=16)
+def _z_score(q):
+    """Standard normal quantile, cached as confidence rarely changes"""
+    return float(_ndtri(q))
+
+
 def value_at_risk(returns, sigma=1, confidence=0.95, prepare_returns=True):
     """
     Calculats the daily value-at-risk
@@ -706,7 +815,10 @@ def value_at_risk(returns, sigma=1, confidence=0.95, prepare_returns=True):
     if confidence > 1:
         confidence = confidence / 100
 
-    return _norm.ppf(1 - confidence, mu, sigma)
+    # norm.ppf(1 - confidence, mu, sigma) without the rv_continuous
+    # dispatch; a non-positive scale is invalid there and gives nan
+    res = _np.asarray(mu + sigma * _z_score(1 - confidence), dtype=_np.float64)
+    return _np.where(_np.asarray(sigma) > 0, res, _np.nan)[()]
 
 
 def var(returns, sigma=1, confidence=0.95, prepare_returns=True):
@@ -722,7 +834,10 @@ def conditional_value_at_risk(returns, sigma=1, confidence=0.95, prepare_returns
     if prepare_returns:
         returns = _utils._prepare_returns(returns)
     var = value_at_risk(returns, sigma, confidence)
-    c_var = returns[returns < var].values.mean()
+    if isinstance(returns, _pd.Series):
+        c_var = _kernels._tail_mean(returns.to_numpy(dtype=_np.float64), float(var))
+    else:
+        c_var = returns[returns < var].values.mean()
     return c_var if ~_np.isnan(c_var) else var
 
 
@@ -743,14 +858,27 @@ def tail_ratio(returns, cutoff=0.95, prepare_returns=True):
     """
     if prepare_returns:
         returns = _utils._prepare_returns(returns)
-    return abs(returns.quantile(cutoff) / returns.quantile(1 - cutoff))
+    right, left = _quantiles(
+        _np.asarray(returns, dtype=_np.float64), [cutoff, 1 - cutoff]
+    )
+    ratio = abs(right / left)
+    if isinstance(returns, _pd.DataFrame):
+        return _pd.Series(ratio, index=returns.columns)
+    return ratio
 
 
 def payoff_ratio(returns, prepare_returns=True):
     """Measures the payoff ratio (average win/average loss)"""
     if prepare_returns:
         returns = _utils._prepare_returns(returns)
-    return avg_win(returns) / abs(avg_loss(returns))
+    return _payoff_ratio(returns, _utils._return_masks(returns))
+
+
+def _payoff_ratio(returns, masks):
+    """Payoff ratio from _utils._return_masks()"""
+    wins = _masked_mean(returns, masks.pos, masks.pos_sum, masks.pos_count)
+    loss = _masked_mean(returns, masks.neg, masks.neg_sum, masks.neg_count)
+    return wins / abs(loss)
 
 
 def win_loss_ratio(returns, prepare_returns=True):
@@ -762,11 +890,15 @@ def profit_ratio(returns, prepare_returns=True):
     """Measures the profit ratio (win ratio / loss ratio)"""
     if prepare_returns:
         returns = _utils._prepare_returns(returns)
-    wins = returns[returns >= 0]
-    loss = returns[returns < 0]
+    masks = _utils._return_masks(returns)
 
-    win_ratio = abs(wins.mean() / wins.count())
-    loss_ratio = abs(loss.mean() / loss.count())
+    # mean / count of the wins (returns >= 0) and losses
+    with _np.errstate(divide="ignore", invalid="ignore"):
+        win_ratio = abs(masks.pos_sum / masks.nonneg_count**2)
+        loss_ratio = abs(masks.neg_sum / masks.neg_count**2)
+    if isinstance(returns, _pd.DataFrame):
+        win_ratio = _pd.Series(win_ratio, index=returns.columns)
+        loss_ratio = _pd.Series(loss_ratio, index=returns.columns)
     try:
         return win_ratio / loss_ratio
     except Exception:
@@ -777,7 +909,12 @@ def profit_factor(returns, prepare_returns=True):
     """Measures the profit ratio (wins/loss)"""
     if prepare_returns:
         returns = _utils._prepare_returns(returns)
-    return abs(returns[returns >= 0].sum() / returns[returns < 0].sum())
+    masks = _utils._return_masks(returns)
+    with _np.errstate(divide="ignore", invalid="ignore"):
+        factor = abs(masks.pos_sum / masks.neg_sum)
+    if isinstance(returns, _pd.DataFrame):
+        return _pd.Series(factor, index=returns.columns)
+    return factor
 
 
 def cpc_index(returns, prepare_returns=True):
@@ -817,12 +954,15 @@ def outlier_loss_ratio(returns, quantile=0.01, prepare_returns=True):
     return returns.quantile(quantile).mean() / returns[returns < 0].mean()
 
 
-def recovery_factor(returns, rf=0.0, prepare_returns=True):
-    """Measures how fast the strategy recovers from drawdowns"""
+def recovery_factor(returns, rf=0.0, prepare_returns=True, dd=None):
+    """
+    Measures how fast the strategy recovers from drawdowns
+    (dd: the returns' to_drawdown_series(), if already computed)
+    """
     if prepare_returns:
         returns = _utils._prepare_returns(returns)
     total_returns = returns.sum() - rf
-    max_dd = max_drawdown(returns)
+    max_dd = max_drawdown(returns) if dd is None else dd.min()
     return abs(total_returns) / abs(max_dd)
 
 
@@ -839,7 +979,14 @@ def risk_return_ratio(returns, prepare_returns=True):
 def max_drawdown(prices):
     """Calculates the maximum drawdown"""
     prices = _utils._prepare_prices(prices)
-    return (prices / prices.expanding(min_periods=0).max()).min() - 1
+    if isinstance(prices, _pd.DataFrame):
+        _df = {}
+        for col in prices.columns:
+            _df[col] = _kernels._drawdown_scan(
+                prices[col].to_numpy(dtype=_np.float64)
+            )[0]
+        return _pd.Series(_df)
+    return _kernels._drawdown_scan(prices.to_numpy(dtype=_np.float64))[0]
 
 
 def to_drawdown_series(returns):
@@ -857,20 +1004,11 @@ def drawdown_details(drawdown):
     """
 
     def _drawdown_details(drawdown):
-        # mark no drawdown
-        no_dd = drawdown == 0
-
-        # extract dd start dates, first date of the drawdown
-        starts = ~no_dd & no_dd.shift(1)
-        starts = list(starts[starts.values].index)
-
-        # extract end dates, last date of the drawdown
-        ends = no_dd & (~no_dd).shift(1)
-        ends = ends.shift(-1, fill_value=False)
-        ends = list(ends[ends.values].index)
+        values = drawdown.to_numpy(dtype=_np.float64)
+        starts, valleys, ends, mins = _kernels._drawdown_periods(values)
 
         # no drawdown :)
-        if not starts:
+        if not len(starts):
             return _pd.DataFrame(
                 index=[],
                 columns=(
@@ -883,48 +1021,26 @@ def drawdown_details(drawdown):
                 ),
             )
 
-        # drawdown series begins in a drawdown
-        if ends and starts[0] > ends[0]:
-            starts.insert(0, drawdown.index[0])
-
-        # series ends in a drawdown fill with last date
-        if not ends or starts[-1] > ends[-1]:
-            ends.append(drawdown.index[-1])
+        # max drawdown without the worst 1% of each period
+        clean_mins = _np.empty(len(starts))
+        for i, (start, end) in enumerate(zip(starts, ends)):
+            dd = -values[start : end + 1]
+            dd = dd[dd < _quantiles(dd, 0.99)]
+            clean_mins[i] = -dd.max() if len(dd) else _np.nan
 
         # build dataframe from results
-        data = []
-        for i, _ in enumerate(starts):
-            dd = drawdown[starts[i] : ends[i]]
-            clean_dd = -remove_outliers(-dd, 0.99)
-            data.append(
-                (
-                    starts[i],
-                    dd.idxmin(),
-                    ends[i],
-                    (ends[i] - starts[i]).days + 1,
-                    dd.min() * 100,
-                    clean_dd.min() * 100,
-                )
-            )
-
+        index = drawdown.index
         df = _pd.DataFrame(
-            data=data,
-            columns=(
-                "start",
-                "valley",
-                "end",
-                "days",
-                "max drawdown",
-                "99% max drawdown",
-            ),
+            {
+                "start": index[starts].strftime("%Y-%m-%d"),
+                "valley": index[valleys].strftime("%Y-%m-%d"),
+                "end": index[ends].strftime("%Y-%m-%d"),
+                "days": (index[ends] - index[starts]).days + 1,
+                "max drawdown": mins * 100,
+                "99% max drawdown": clean_mins * 100,
+            }
         )
         df["days"] = df["days"].astype(int)
-        df["max drawdown"] = df["max drawdown"].astype(float)
-        df["99% max drawdown"] = df["99% max drawdown"].astype(float)
-
-        df["start"] = df["start"].dt.strftime("%Y-%m-%d")
-        df["end"] = df["end"].dt.strftime("%Y-%m-%d")
-        df["valley"] = df["valley"].dt.strftime("%Y-%m-%d")
 
         return df
 
@@ -945,8 +1061,9 @@ def kelly_criterion(returns, prepare_returns=True):
     """
     if prepare_returns:
         returns = _utils._prepare_returns(returns)
-    win_loss_ratio = payoff_ratio(returns)
-    win_prob = win_rate(returns)
+    masks = _utils._return_masks(returns)
+    win_loss_ratio = _payoff_ratio(returns, masks)
+    win_prob = _win_rate(masks)
     lose_prob = 1 - win_prob
 
     return ((win_loss_ratio * win_prob) - lose_prob) / win_loss_ratio
@@ -1007,9 +1124,12 @@ def greeks(returns, benchmark, periods=365.0, prepare_returns=True):
     benchmark = _utils._prepare_benchmark(benchmark, returns.index)
     # ----------------------------
 
-    # find covariance
-    matrix = _np.cov(returns, benchmark)
-    beta = matrix[0, 1] / matrix[1, 1]
+    # beta = cov / var, the n - 1 terms cancel out
+    ret = _np.asarray(returns, dtype=_np.float64)
+    bench = _np.asarray(benchmark, dtype=_np.float64)
+    bench_c = bench - bench.mean()
+    with _np.errstate(divide="ignore", invalid="ignore"):
+        beta = ((ret - ret.mean()) @ bench_c) / (bench_c @ bench_c)
 
     # calculates measures now
     alpha = returns.mean() - beta * benchmark.mean()
@@ -1035,9 +1155,36 @@ def rolling_greeks(returns, benchmark, periods=365, prepare_returns=True):
         }
     )
     df = df.fillna(0)
-    corr = df.rolling(int(periods)).corr().unstack()["returns"]["benchmark"]
-    std = df.rolling(int(periods)).std()
-    beta = corr * std["returns"] / std["benchmark"]
+    window = int(periods)
+    beta = _np.full(len(df), _np.nan)
+
+    if 0 < window <= len(df):
+        ret = df["returns"].to_numpy(dtype=_np.float64)
+        bench = df["benchmark"].to_numpy(dtype=_np.float64)
+
+        def _window_sums(values):
+            cumsum = _np.cumsum(_np.r_[0.0, values])
+            return cumsum[window:] - cumsum[:-window]
+
+        def _is_flat(values):
+            # no value changes inside the window
+            changes = _np.r_[0, _np.cumsum(values[1:] != values[:-1])]
+            return changes[window - 1 :] == changes[: len(values) - window + 1]
+
+        # beta = cov / var, centered to keep the running sums small
+        ret_c = ret - ret.mean()
+        bench_c = bench - bench.mean()
+        sum_ret = _window_sums(ret_c)
+        sum_bench = _window_sums(bench_c)
+        cov = _window_sums(ret_c * bench_c) - sum_ret * sum_bench / window
+        var = _window_sums(bench_c * bench_c) - sum_bench * sum_bench / window
+
+        # write cov / var straight into beta, flat windows have no correlation
+        with _np.errstate(divide="ignore", invalid="ignore"):
+            _np.divide(cov, var, out=beta[window - 1 :])
+        beta[window - 1 :][_is_flat(ret) | _is_flat(bench)] = _np.nan
+
+    beta = _pd.Series(beta, index=df.index)
 
     alpha = df["returns"].mean() - beta * df["benchmark"].mean()
 
@@ -1060,31 +1207,37 @@ def compare(
         returns = _utils._prepare_returns(returns)
     benchmark = _utils._prepare_benchmark(benchmark, returns.index)
 
+    bench = _utils.aggregate_returns(benchmark, aggregate, compounded)
+
     if isinstance(returns, _pd.Series):
+        strategy = _utils.aggregate_returns(returns, aggregate, compounded)
+        if not bench.index.equals(strategy.index):
+            aligned = _pd.DataFrame({"Benchmark": bench, "Returns": strategy})
+            bench, strategy = aligned["Benchmark"], aligned["Returns"]
+
+        # fill a single block instead of building column by column
+        values = _np.empty((len(strategy), 3))
+        _np.multiply(bench.to_numpy(dtype=_np.float64), 100, out=values[:, 0])
+        _np.multiply(strategy.to_numpy(dtype=_np.float64), 100, out=values[:, 1])
+        with _np.errstate(divide="ignore", invalid="ignore"):
+            _np.divide(values[:, 1], values[:, 0], out=values[:, 2])
+        won = _np.where(values[:, 1] >= values[:, 0], "+", "-")
+        if round_vals is not None:
+            _np.round(values, round_vals, out=values)
+
         data = _pd.DataFrame(
-            data={
-                "Benchmark": _utils.aggregate_returns(benchmark, aggregate, compounded)
-                * 100,
-                "Returns": _utils.aggregate_returns(returns, aggregate, compounded)
-                * 100,
-            }
+            values,
+            index=strategy.index,
+            columns=["Benchmark", "Returns", "Multiplier"],
         )
+        data["Won"] = won
+        return data
 
-        data["Multiplier"] = data["Returns"] / data["Benchmark"]
-        data["Won"] = _np.where(data["Returns"] >= data["Benchmark"], "+", "-")
-    elif isinstance(returns, _pd.DataFrame):
-        bench = {
-            "Benchmark": _utils.aggregate_returns(benchmark, aggregate, compounded)
-            * 100
-        }
-        strategy = {
-            "Returns_" + str(i): _utils.aggregate_returns(
-                returns[col], aggregate, compounded
-            )
-            * 100
-            for i, col in enumerate(returns.columns)
-        }
-        data = _pd.DataFrame(data={**bench, **strategy})
+    # aggregate all strategies at once
+    strategy = _utils.aggregate_returns(returns, aggregate, compounded) * 100
+    strategy.columns = ["Returns_" + str(i) for i in range(len(returns.columns))]
+    data = _pd.concat([bench * 100, strategy], axis=1)
+    data.columns = ["Benchmark"] + list(strategy.columns)
 
     if round_vals is not None:
         return _np.round(data, round_vals)
@@ -1172,7 +1325,7 @@ def monthly_returns(returns, eoy=True, compounded=True, prepare_returns=True):
 
 
 # Calculate the romad (return/cagr over max drawdown) of a strategy
-def romad(returns, periods=365, annualize=True, smart=False):
+def romad(returns, periods=365, annualize=True, smart=False, dd=None):
     """
     Calculates the romad (return/cagr over max drawdown) of a strategy
     Args:
@@ -1180,5 +1333,7 @@ def romad(returns, periods=365, annualize=True, smart=False):
         * periods (int): Freq. of returns
         * annualize: return annualize sharpe?
         * smart: return smart sharpe ratio
+        * dd: the returns' drawdown series, if already computed
     """
-    return cagr(returns, periods=periods) / -max_drawdown(returns)
+    max_dd = max_drawdown(returns) if dd is None else dd.min()
+    return cagr(returns, periods=periods) / -max_dd
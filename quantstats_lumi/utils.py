@@ -19,11 +19,13 @@
 
 import io as _io
 import datetime as _dt
+from collections import namedtuple as _namedtuple
 import pandas as _pd
 import numpy as _np
 import yfinance as _yf
 from . import stats as _stats
 import inspect
+import warnings as _warnings
 
 
 def _mtd(df):
@@ -182,12 +184,25 @@ def to_excess_returns(returns, rf, nperiods=None):
     return returns - rf
 
 
+def _column_bounds(data):
+    """Returns the nan-skipping min and max of every column at once"""
+    values = data.to_numpy(dtype=_np.float64)
+    if not len(values):
+        empty = _np.full(values.shape[1], _np.nan)
+        return empty, empty
+    # all-nan columns give nan, same as Series.min() / max()
+    with _warnings.catch_warnings():
+        _warnings.simplefilter("ignore", RuntimeWarning)
+        return _np.nanmin(values, axis=0), _np.nanmax(values, axis=0)
+
+
 def _prepare_prices(data, base=1.0):
     """Converts return data into prices + cleanup"""
     data = data.copy()
     if isinstance(data, _pd.DataFrame):
-        for col in data.columns:
-            if data[col].dropna().min() <= 0 or data[col].dropna().max() < 1:
+        lows, highs = _column_bounds(data)
+        for col, low, high in zip(data.columns, lows, highs):
+            if low <= 0 or high < 1:
                 data[col] = to_prices(data[col], base)
 
     # is it returns?
@@ -201,22 +216,36 @@ def _prepare_prices(data, base=1.0):
     return data
 
 
-def _prepare_returns(data, rf=0.0, nperiods=None):
-    """Converts price data into returns + cleanup"""
-    data = data.copy()
-    function = inspect.stack()[1][3]
-    if isinstance(data, _pd.DataFrame):
-        for col in data.columns:
-            if data[col].dropna().min() >= 0 and data[col].dropna().max() > 1:
-                data[col] = data[col].pct_change()
-    elif data.min() >= 0 and data.max() > 1:
-        data = data.pct_change()
+def _mark_prepared(data):
+    """
+    Flags data as already cleaned up by _prepare_returns(),
+    so passing it to other stats skips the conversion + copy.
+    The flag doesn't survive copies or arithmetic on data.
+    """
+    object.__setattr__(data, "_qs_prepared", True)
+    return data
 
-    # cleanup data
-    data = data.replace([_np.inf, -_np.inf], float("NaN"))
 
-    if isinstance(data, (_pd.DataFrame, _pd.Series)):
-        data = data.fillna(0).replace([_np.inf, -_np.inf], float("NaN"))
+def _prepare_returns(data, rf=0.0, nperiods=None):
+    """Converts price data into returns + cleanup"""
+    # inspect.stack() resolves the source of every frame, way too slow here
+    function = inspect.currentframe().f_back.f_code.co_name
+
+    if not getattr(data, "_qs_prepared", False):
+        data = data.copy()
+        if isinstance(data, _pd.DataFrame):
+            lows, highs = _column_bounds(data)
+            for col, low, high in zip(data.columns, lows, highs):
+                if low >= 0 and high > 1:
+                    data[col] = data[col].pct_change()
+        elif data.min() >= 0 and data.max() > 1:
+            data = data.pct_change()
+
+        # cleanup data
+        data = data.replace([_np.inf, -_np.inf], float("NaN"))
+
+        if isinstance(data, (_pd.DataFrame, _pd.Series)):
+            data = data.fillna(0).replace([_np.inf, -_np.inf], float("NaN"))
     unnecessary_function_calls = [
         "_prepare_benchmark",
         "cagr",
@@ -258,7 +287,12 @@ def _prepare_benchmark(benchmark=None, period="max", rf=0.0, prepare_returns=Tru
     elif isinstance(benchmark, _pd.DataFrame):
         benchmark = benchmark[benchmark.columns[0]].copy()
 
-    if isinstance(period, _pd.DatetimeIndex) and set(period) != set(benchmark.index):
+    # an identical index (the common case) needs no set comparison
+    if (
+        isinstance(period, _pd.DatetimeIndex)
+        and not benchmark.index.equals(period)
+        and set(period) != set(benchmark.index)
+    ):
 
         # Adjust Benchmark to Strategy frequency
         benchmark_prices = to_prices(benchmark, base=1)
@@ -271,7 +305,9 @@ def _prepare_benchmark(benchmark=None, period="max", rf=0.0, prepare_returns=Tru
         )
         benchmark = benchmark[benchmark.index.isin(period)]
 
-    benchmark.index = benchmark.index.tz_localize(None)
+    if getattr(benchmark.index, "tz", None) is not None:
+        benchmark = benchmark.copy(deep=False)
+        benchmark.index = benchmark.index.tz_localize(None)
 
     if prepare_returns:
         return _prepare_returns(benchmark.dropna(), rf=rf)
@@ -285,11 +321,23 @@ def _round_to_closest(val, res, decimals=None):
     return round(round(val / res) * res, decimals)
 
 
+def _flat1(value):
+    """Returns a one level list/tuple as a list, anything else as [value]"""
+    return list(value) if isinstance(value, (list, tuple)) else [value]
+
+
 def _file_stream():
     """Returns a file stream"""
     return _io.BytesIO()
 
 
+def _reset_stream(stream):
+    """Empties a file stream so it can be reused"""
+    stream.seek(0)
+    stream.truncate(0)
+    return stream
+
+
 def _in_notebook(matplotlib_inline=False):
     """Identify enviroment (notebook, terminal, etc)"""
     try:
@@ -322,6 +370,44 @@ def _count_consecutive(data):
     return _count(data)
 
 
+_ReturnMasks = _namedtuple(
+    "_ReturnMasks",
+    [
+        "values",
+        "pos",
+        "neg",
+        "pos_count",
+        "neg_count",
+        "nonzero_count",
+        "nonneg_count",
+        "pos_sum",
+        "neg_sum",
+    ],
+)
+
+
+def _return_masks(returns):
+    """
+    Computes the win/loss masks of returns along with their
+    counts and sums (per column for DataFrames) in one go,
+    so stats that need several of them scan the data once
+    """
+    values = _np.asarray(returns, dtype=_np.float64)
+    pos = values > 0
+    neg = values < 0
+    return _ReturnMasks(
+        values,
+        pos,
+        neg,
+        pos.sum(axis=0),
+        neg.sum(axis=0),
+        (values != 0).sum(axis=0),
+        (values >= 0).sum(axis=0),
+        _np.where(pos, values, 0.0).sum(axis=0),
+        _np.where(neg, values, 0.0).sum(axis=0),
+    )
+
+
 def _score_str(val):
     """Returns + sign for positive values (used in plots)"""
     return ("" if "-" in val else "+") + str(val)